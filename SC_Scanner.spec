@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['gui'],  # Imported lazily by main.py
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
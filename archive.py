@@ -0,0 +1,266 @@
+import bisect
+import json
+import lzma
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+from checkpoint import log_key
+from events import event_dict
+from log_parser import log_timestamp
+from scanner import scan_events
+from tailer import open_shared
+
+BLOCK_SIZE = 1024 * 1024  # Bytes of log per compressed block
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.expanduser('~'), 'sc_scanner_archives')
+ARCHIVE_SUFFIX = '.scarc'
+FORMAT_VERSION = 1
+MAGIC = b'SCLOGARC'
+HEADER = struct.Struct('<8sH')  # Magic, format version
+FOOTER = struct.Struct('<QQ8s')  # Index offset, index length, magic
+
+# Every block is compressed on its own, so any one of them can be read
+# without the others
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+}
+DEFAULT_CODEC = 'lzma'
+
+# Accepted forms for a time bound, with the length of the period they name
+TIME_FORMATS = (('%Y-%m-%d %H:%M:%S', 1), ('%Y-%m-%d %H:%M', 60), ('%Y-%m-%d %H', 3600), ('%Y-%m-%d', 86400))
+
+
+def parse_time(text, end=False):
+    # Local time as typed in the kill filter -> epoch. A bare date (or hour)
+    # names the whole period: as an end bound it includes all of it.
+    for fmt, period in TIME_FORMATS:
+        try:
+            epoch = time.mktime(time.strptime(text.strip(), fmt))
+        except ValueError:
+            continue
+        return epoch + period if end else epoch
+    raise ValueError(f"Unrecognized time: {text}")
+
+
+def _line_time(raw):
+    # Epoch of a raw line, None when it has no timestamp
+    stamp = log_timestamp(raw[:32].decode('ascii', errors='replace'))
+    return stamp[1] if stamp else None
+
+
+def _block_times(data):
+    # First and last timestamp in a block, searched from both ends of its lines
+    lines = data.split(b'\n')
+    first = next((t for t in map(_line_time, lines) if t is not None), None)
+    last = next((t for t in map(_line_time, reversed(lines)) if t is not None), None)
+    return first, last
+
+
+def archive_name(path):
+    # <session start>-<log key>.scarc, so archives sort by date
+    with open(path, 'rb') as f:
+        first = _line_time(f.readline())
+    started = time.strftime('%Y%m%d-%H%M%S', time.localtime(first if first is not None else os.path.getmtime(path)))
+    return f'{started}-{(log_key(path) or "empty")[:8]}{ARCHIVE_SUFFIX}'
+
+
+def write_archive(log_path, archive_path, codec=DEFAULT_CODEC, block_size=BLOCK_SIZE,
+                  progress=None, cancelled=None):
+    # Archives the log as it is now: the raw bytes in independently
+    # compressed blocks cut at line boundaries, the events extracted from
+    # it, and an index of both. Returns a summary, or None when cancelled.
+    compress = CODECS[codec][0]
+    size = os.path.getsize(log_path)
+    blocks = []  # [archive offset, compressed length, log offset, length, first time, last time]
+    tmp_path = archive_path + '.tmp'
+    try:
+        with open_shared(log_path) as src, open(tmp_path, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+            log_offset = 0
+            carry = b''
+            while log_offset < size:
+                if cancelled is not None and cancelled.is_set():
+                    break
+                chunk = src.read(min(block_size, size - log_offset - len(carry)))
+                data = carry + chunk
+                at_end = not chunk or log_offset + len(data) >= size
+                # Blocks end after a complete line; a line longer than a block
+                # makes the block longer instead
+                cut = len(data) if at_end else data.rfind(b'\n') + 1
+                if cut == 0:
+                    carry = data
+                    continue
+                block, carry = data[:cut], data[cut:]
+                compressed = compress(block)
+                blocks.append([out.tell(), len(compressed), log_offset, len(block), *_block_times(block)])
+                out.write(compressed)
+                log_offset += len(block)
+                if progress:
+                    progress(0.8 * log_offset / size)
+
+            if cancelled is not None and cancelled.is_set():
+                out.close()
+                os.remove(tmp_path)
+                return None
+
+            events = [json.dumps(event_dict(event)) for event in scan_events(log_path, end=log_offset)]
+            compressed = compress('\n'.join(events).encode('utf-8'))
+            events_entry = [out.tell(), len(compressed), len(events)]
+            out.write(compressed)
+
+            index = {
+                'version': FORMAT_VERSION,
+                'codec': codec,
+                'name': os.path.basename(log_path),
+                'log_key': log_key(log_path),
+                'size': log_offset,
+                'created': time.time(),
+                'blocks': blocks,
+                'events': events_entry,
+            }
+            index_data = zlib.compress(json.dumps(index).encode('utf-8'))
+            index_offset = out.tell()
+            out.write(index_data)
+            out.write(FOOTER.pack(index_offset, len(index_data), MAGIC))
+            archived_size = out.tell()
+    except BaseException:
+        # Never leave half an archive behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, archive_path)
+    if progress:
+        progress(1.0)
+    return {'path': archive_path, 'size': log_offset, 'archived_size': archived_size,
+            'blocks': len(blocks), 'events': len(events)}
+
+
+class SessionArchive:
+    # Read side of an archive. Only the index is loaded when it is opened;
+    # a time range is found with a binary search over the block times and
+    # only the blocks overlapping it are decompressed.
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            magic, version = HEADER.unpack(self.file.read(HEADER.size))
+            self.file.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, index_length, end_magic = FOOTER.unpack(self.file.read(FOOTER.size))
+            if magic != MAGIC or end_magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("bad header or footer")
+            self.file.seek(index_offset)
+            self.index = json.loads(zlib.decompress(self.file.read(index_length)))
+            self.decompress = CODECS[self.index['codec']][1]
+            self.blocks = self.index['blocks']
+        except Exception as e:
+            self.file.close()
+            # Short, truncated or foreign files all end up here
+            raise ValueError(f"Not a valid log archive: {path} ({e})") from e
+
+        # Latest time up to the end of each block, for the binary search in
+        # lines(); a block without timestamps keeps that of the block before
+        self.last_times = []
+        last = float('-inf')
+        for *_, last_time in self.blocks:
+            last = max(last, last_time) if last_time is not None else last
+            self.last_times.append(last)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_block(self, number):
+        archive_offset, length = self.blocks[number][:2]
+        return self._read(archive_offset, length, f"block {number}")
+
+    def _read(self, archive_offset, length, what):
+        self.file.seek(archive_offset)
+        try:
+            return self.decompress(self.file.read(length))
+        except Exception as e:
+            raise ValueError(f"Corrupt {what} in {self.path} ({e})") from e
+
+    def lines(self, since=None, until=None, encoding='utf-8'):
+        # (offset, text) of the lines logged from since up to (not including)
+        # until, both epoch seconds; None leaves that side open
+        number = bisect.bisect_left(self.last_times, since) if since is not None else 0
+        current = self.last_times[number - 1] if number > 0 else None
+        # A block starting at or after until is still read: lines without a
+        # timestamp at its top belong to the time before it. The first
+        # stamped line ends the search.
+        for number in range(number, len(self.blocks)):
+            offset = self.blocks[number][2]
+            raw_lines = self.read_block(number).split(b'\n')
+            if not raw_lines[-1]:
+                raw_lines.pop()  # Blocks end with a newline, except maybe the last one
+            for raw in raw_lines:
+                line_time = _line_time(raw)
+                if line_time is not None:
+                    current = line_time
+                if until is not None and current is not None and current >= until:
+                    return
+                if since is None or (current is not None and current >= since):
+                    yield offset, raw.decode(encoding, errors='replace').rstrip('\r')
+                offset += len(raw) + 1
+
+    def events(self, kinds=None, since=None, until=None):
+        # The extracted events as dicts (the JSON form written by the headless
+        # mode), optionally limited to kinds and to a time range like lines()
+        archive_offset, length, count = self.index['events']
+        if not count:
+            return []
+        events = [json.loads(line) for line in self._read(archive_offset, length, "events").decode('utf-8').split('\n')]
+        events = [event for event in events if kinds is None or event['kind'] in kinds]
+        if since is not None or until is not None:
+            events = [event for event in events
+                      if (since is None or parse_time(event['timestamp']) >= since)
+                      and (until is None or parse_time(event['timestamp']) < until)]
+        return events
+
+
+class SessionArchiver(threading.Thread):
+    # Archives logs into a folder in the background. Progress is reported
+    # through the results queue as ('progress', message, fraction),
+    # followed by ('done', message, 1.0) or ('error', message, fraction).
+
+    def __init__(self, paths, folder, codec=DEFAULT_CODEC):
+        super().__init__(daemon=True)
+        self.paths = paths
+        self.folder = folder
+        self.codec = codec
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        fraction = 0.0
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            size = archived_size = 0
+            for number, path in enumerate(self.paths):
+                def progress(done, number=number):
+                    self.results.put(('progress', f"Archiving {os.path.basename(path)}",
+                                      (number + done) / len(self.paths)))
+                summary = write_archive(path, os.path.join(self.folder, archive_name(path)), self.codec,
+                                        progress=progress, cancelled=self.cancelled)
+                if summary is None:
+                    return
+                size += summary['size']
+                archived_size += summary['archived_size']
+                fraction = (number + 1) / len(self.paths)
+            self.results.put(('done', f"Archived {len(self.paths)} logs into {self.folder} "
+                                      f"({size / 1e6:.1f} MB -> {archived_size / 1e6:.1f} MB)", 1.0))
+        except Exception as e:
+            self.results.put(('error', str(e), fraction))
@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from log_parser import log_timestamp
+from metrics import Histogram
+from monitor import LogMonitor
+from scanner import scan_events
+from scheduler import Backoff
+
+# Replays a recorded Game.log into a target file the way the game would
+# write it, while the same reader pipeline the GUI uses follows the target.
+# Reports how long events took from being written to being drained, events
+# that were lost or delivered twice, and how responsive the consumer loop
+# stayed. Run from the repository root:
+#   python -m benchmarks.replay recorded.log replay.log --speed 10
+#   python -m benchmarks.replay recorded.log replay.log --speed 0        # as fast as possible
+#   python -m benchmarks.replay recorded.log replay.log --burst-lines 5000 --burst-interval 0.5
+#
+# Point the GUI at the target file to watch a replay live.
+
+# Consumer loop timing of gui.Application.check_updates
+UPDATE_MIN_INTERVAL = 0.016
+UPDATE_MAX_INTERVAL = 0.1
+FAST_WRITE_BYTES = 64 * 1024  # Most bytes per write, reached when replaying as fast as possible
+
+
+class Replayer(threading.Thread):
+    # Copies the recorded log into the target line by line, keeping the
+    # bytes (and so the offsets) identical. Records when every line that
+    # holds an event was written.
+
+    def __init__(self, source, target, event_offsets, speed=1.0, burst_lines=None, burst_interval=1.0):
+        super().__init__(daemon=True)
+        self.source = source
+        self.target = target
+        self.event_offsets = event_offsets
+        self.speed = speed
+        self.burst_lines = burst_lines
+        self.burst_interval = burst_interval
+        self.written_at = {}  # Offset of an event line -> time it was written
+        self.bytes = 0
+        self.lines = 0
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            with open(self.source, 'rb') as src, open(self.target, 'ab') as out:
+                pending = []
+                pending_bytes = 0
+                first = None
+                for raw in src:
+                    wait = 0
+                    if self.burst_lines:
+                        if len(pending) >= self.burst_lines:
+                            wait = self.burst_interval
+                    elif self.speed > 0:
+                        # Lines are written when their log time comes up, scaled by speed
+                        stamp = log_timestamp(raw[:32].decode('ascii', errors='replace'))
+                        if stamp is not None:
+                            if first is None:
+                                first, started = stamp[1], time.perf_counter()
+                            wait = started + (stamp[1] - first) / self.speed - time.perf_counter()
+                    if wait > 0 or (pending_bytes >= FAST_WRITE_BYTES and not self.burst_lines):
+                        self._write(out, pending)
+                        pending = []
+                        pending_bytes = 0
+                        if wait > 0:
+                            time.sleep(wait)
+                    pending.append(raw)
+                    pending_bytes += len(raw)
+                self._write(out, pending)
+        finally:
+            self.finished.set()
+
+    def _write(self, out, lines):
+        if not lines:
+            return
+        out.write(b''.join(lines))
+        out.flush()
+        now = time.perf_counter()
+        offset = self.bytes
+        for line in lines:
+            if offset in self.event_offsets:
+                self.written_at[offset] = now
+            offset += len(line)
+        self.bytes = offset
+        self.lines += len(lines)
+
+
+def consume(monitor, replayer, expected, idle_timeout):
+    # The Tk side of the pipeline without widgets: drain every tick, backing
+    # off while idle, and time each tick and how late it started
+    backoff = Backoff(UPDATE_MIN_INTERVAL, UPDATE_MAX_INTERVAL)
+    lag = Histogram()
+    tick = Histogram()
+    late = Histogram()
+    received = {}
+    interval = UPDATE_MIN_INTERVAL
+    last_event = time.perf_counter()
+    planned = time.perf_counter()
+    while True:
+        started = time.perf_counter()
+        late.add(max(0.0, started - planned))
+        events = monitor.drain()
+        for event in events:
+            if event.kind == 'line':
+                continue
+            key = (event.offset, event.kind)
+            received[key] = received.get(key, 0) + 1
+            written = replayer.written_at.get(event.offset)
+            if written is not None:
+                lag.add(max(0.0, started - written))
+        done = time.perf_counter()
+        tick.add(done - started)
+        if events:
+            last_event = done
+        if replayer.finished.is_set() and (
+                monitor.position >= replayer.bytes or done - last_event > idle_timeout):
+            break
+        interval = backoff.update(bool(events))
+        planned = done + interval
+        time.sleep(interval)
+
+    missing = [key for key in expected if key not in received]
+    duplicated = sum(count - 1 for count in received.values() if count > 1)
+    unexpected = sum(1 for key in received if key not in expected)
+    return {
+        'events_expected': len(expected),
+        'events_received': sum(received.values()),
+        'dropped': len(missing),
+        'duplicated': duplicated,
+        'unexpected': unexpected,
+        'lag': lag.summary(),
+        'ui_tick': tick.summary(),
+        'ui_tick_late': late.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Game.log into a file; prints JSON")
+    parser.add_argument('source', help="Recorded log")
+    parser.add_argument('target', help="File to write, replaced if it exists")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Multiple of the recorded pace; 0 writes as fast as possible")
+    parser.add_argument('--burst-lines', type=int, help="Write this many lines at a time instead")
+    parser.add_argument('--burst-interval', type=float, default=1.0, help="Seconds between bursts")
+    parser.add_argument('--idle-timeout', type=float, default=10.0,
+                        help="Give up waiting for events this long after the last one")
+    parser.add_argument('--watch', action='store_true', help="Use file notifications like the GUI")
+    parser.add_argument('--output', help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    print("Scanning the recorded log...", file=sys.stderr)
+    expected = {(event.offset, event.kind) for event in scan_events(args.source)}
+    open(args.target, 'wb').close()
+
+    monitor = LogMonitor(args.target)
+    observer = None
+    if args.watch:
+        from watchdog.observers import Observer
+        observer = Observer()
+        observer.schedule(monitor, os.path.dirname(os.path.abspath(args.target)), recursive=False)
+        observer.start()
+    replayer = Replayer(args.source, args.target, {offset for offset, _ in expected}, args.speed,
+                        args.burst_lines, args.burst_interval)
+
+    print("Replaying...", file=sys.stderr)
+    started = time.perf_counter()
+    monitor.start()
+    replayer.start()
+    try:
+        result = consume(monitor, replayer, expected, args.idle_timeout)
+    finally:
+        monitor.stop()
+        if observer:
+            observer.stop()
+            observer.join()
+    elapsed = time.perf_counter() - started
+
+    mode = ({'bursts': args.burst_lines, 'burst_interval': args.burst_interval} if args.burst_lines
+            else {'speed': args.speed or 'max'})
+    report = dict(mode, seconds=elapsed, lines=replayer.lines, bytes=replayer.bytes,
+                  bytes_per_sec=replayer.bytes / elapsed if elapsed else None, **result)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synth_log import generate_log
+from history import HistoryLoader
+from kill_store import KillStore
+from log_parser import parse_line
+from metrics import Metrics
+from scanner import scan_events
+from tailer import DEFAULT_MAX_LINES, LogTailer, read_lines_before
+
+# Headless benchmarks of the log pipeline against a synthetic (or given)
+# Game.log. Run from the repository root:
+#   python -m benchmarks.run --size 100 --output results.json
+# Timings come from a plain run; peak memory is measured in a second run
+# under tracemalloc, which would otherwise slow the timed run down.
+
+
+def bench_parse(path):
+    with open(path, 'rb') as f:
+        lines = [raw.decode('utf-8', errors='replace').rstrip('\r\n') for raw in f]
+    start = time.perf_counter()
+    events = 0
+    for offset, line in enumerate(lines):
+        if parse_line(line, offset) is not None:
+            events += 1
+    elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'lines': len(lines), 'events': events,
+            'lines_per_sec': len(lines) / elapsed if elapsed else None}
+
+
+def bench_tail(path):
+    metrics = Metrics()
+    tailer = LogTailer(path, metrics=metrics)
+    start = time.perf_counter()
+    lines = 0
+    events = 0
+    for event in tailer.events():
+        if event.kind == 'line':
+            lines += 1
+        else:
+            events += 1
+    elapsed = time.perf_counter() - start
+    size = tailer.position
+    tailer.close()
+    return {'seconds': elapsed, 'bytes': size, 'lines': lines, 'events': events,
+            'bytes_per_sec': size / elapsed if elapsed else None,
+            'lines_per_sec': lines / elapsed if elapsed else None,
+            'stages': {stage: summary for stage, summary in metrics.snapshot()['latency'].items()
+                       if summary['count']}}
+
+
+def bench_scan(path):
+    # The history backfill: only lines holding an event tag are decoded
+    start = time.perf_counter()
+    events = sum(1 for _ in scan_events(path))
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {'seconds': elapsed, 'bytes': size, 'events': events,
+            'bytes_per_sec': size / elapsed if elapsed else None}
+
+
+def bench_cold_start(path, store_path):
+    # Mirrors Application.setup_file_monitoring without a checkpoint: show
+    # the tail of the log right away, then backfill the rest in the
+    # background. Measures the time until the first kill reaches the store.
+    start = time.perf_counter()
+    first_kill = None
+    store = KillStore(store_path)
+    try:
+        end = os.path.getsize(path)
+        lines, tail_start = read_lines_before(path, end, DEFAULT_MAX_LINES)
+        kills = [event for event in (parse_line(text, offset) for offset, text in lines)
+                 if event is not None and event.kind == 'kill']
+        store.add_kills('bench', kills)
+        tail_seconds = time.perf_counter() - start
+        if kills:
+            first_kill = tail_seconds
+
+        loader = HistoryLoader(path, lines[0][0] if lines else tail_start)
+        loader.start()
+        while True:
+            kind, payload, _ = loader.results.get()
+            if kind == 'batch':
+                kills = [event for event in payload if event.kind == 'kill']
+                store.add_kills('bench', kills)
+                if kills and first_kill is None:
+                    first_kill = time.perf_counter() - start
+            elif kind == 'error':
+                raise RuntimeError(payload)
+            else:
+                break
+        loader.join()
+        total = time.perf_counter() - start
+    finally:
+        store.close()
+    return {'tail_seconds': tail_seconds, 'first_kill_seconds': first_kill, 'backfill_seconds': total}
+
+
+BENCHMARKS = {
+    'parse': lambda path, workdir: bench_parse(path),
+    'tail': lambda path, workdir: bench_tail(path),
+    'scan': lambda path, workdir: bench_scan(path),
+    'cold_start': lambda path, workdir: bench_cold_start(path, os.path.join(workdir, 'kills.db')),
+}
+
+
+def run(name, path, workdir, memory):
+    store_path = os.path.join(workdir, 'kills.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(store_path + suffix):
+            os.remove(store_path + suffix)
+    if not memory:
+        return BENCHMARKS[name](path, workdir)
+    tracemalloc.start()
+    try:
+        BENCHMARKS[name](path, workdir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the log pipeline; prints JSON")
+    parser.add_argument('--log', help="Benchmark this log instead of generating one")
+    parser.add_argument('--size', type=float, default=50, help="Generated log size in MB")
+    parser.add_argument('--kill-density', type=float, default=0.001)
+    parser.add_argument('--noise-ratio', type=float, default=0.95)
+    parser.add_argument('--line-length', type=int, default=160)
+    parser.add_argument('--unicode-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS),
+                        help="Run only this benchmark (can be repeated)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak memory runs")
+    parser.add_argument('--output', help="Write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        report = {'python': platform.python_version(), 'platform': platform.platform()}
+        if args.log:
+            path = args.log
+            report['log'] = {'path': os.path.abspath(path)}
+        else:
+            path = os.path.join(workdir, 'Game.log')
+            options = {'kill_density': args.kill_density, 'noise_ratio': args.noise_ratio,
+                       'line_length': args.line_length, 'unicode_ratio': args.unicode_ratio,
+                       'seed': args.seed}
+            lines, kills = generate_log(path, int(args.size * 1024 * 1024), **options)
+            report['log'] = dict(options, lines=lines, kills=kills)
+        report['log']['bytes'] = os.path.getsize(path)
+        report['benchmarks'] = {}
+
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name}...", file=sys.stderr)
+            result = run(name, path, workdir, memory=False)
+            if not args.no_memory:
+                result['peak_memory_bytes'] = run(name, path, workdir, memory=True)
+            report['benchmarks'][name] = result
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import argparse
+import datetime
+import random
+
+# Generates Game.log files that look like the real thing: mostly network,
+# asset and UI noise, with actor deaths, vehicle destruction, spawns and
+# quantum travel mixed in at a configurable rate.
+
+NOISE_TEMPLATES = (
+    '[Notice] <Context Establisher Done> establisher="CReplicationModel" runningTime={n}.{m} map="megamap" '
+    'gamerules="SC_Default" sessionId="{hex}" [Team_Network][Network][Replication][Loading][Persistence]',
+    '[Trace] @net_entity_bind: entity {n} bound to channel {m} ({hex})',
+    '[Notice] <SHUDEvent_OnNotification> Added notification "Entered Monitored Space: " [{n}] to queue. '
+    'New queue size: {m}, MissionId: [00000000-0000-0000-0000-000000000000] [Team_CoreGameplayFeatures][Missions]',
+    '[Notice] <StatObjLoad 0x800 Format> \'Objects/Spaceships/Ships/AEGS/Gladius/{hex}.cga\' '
+    'Error: geometry does not contain any LODs [Team_Graphics][Graphics]',
+    '[Notice] <CEntityComponentInstancedInterior::OnEntityLeaveZone> [InstancedInterior] OnEntityLeaveZone - '
+    'InstancedInterior [Hangar_{m}] [{n}] -> Entity [{player}] [{n}] [Team_CoreGameplayFeatures][Cargo]',
+    'Loading screen for Stanton : SC_Frontend closed after {n}.{m} seconds',
+)
+
+ZONES = ('OOC_Stanton_1_Hurston', 'OOC_Stanton_2b_Daymar', 'ANVL_Hornet_F7C_{n}', 'AEGS_Gladius_{n}',
+         'RSI_Constellation_Andromeda_{n}', 'Hangar_LargeFront_Lorville_{n}')
+WEAPONS = ('KLWE_LaserRepeater_S3_{n}', 'BEHR_BallisticGatling_S4_{n}', 'behr_rifle_ballistic_01_{n}', 'unknown')
+DAMAGE_TYPES = ('VehicleDestruction', 'Bullet', 'Crash', 'SelfDestruct', 'Suicide')
+
+ASCII_NAMES = ('Maverick', 'xX_Sniper_Xx', 'BoxCrate', 'Quantum_Jack', 'NovaPilot', 'Dread0', 'RustyBolt')
+UNICODE_NAMES = ('Škoda_Pilot', 'Ærø', 'Léa_Moreau', 'Дмитрий', '星际公民', 'Ünlü', 'Søren_K')
+
+
+class LogGenerator:
+    def __init__(self, kill_density=0.001, noise_ratio=0.95, line_length=160, unicode_ratio=0.1,
+                 players=200, seed=0):
+        self.kill_density = kill_density  # Fraction of lines that are actor deaths
+        self.noise_ratio = noise_ratio  # Of the remaining lines, fraction without a known event tag
+        self.line_length = line_length  # Noise lines are padded to about this many characters
+        self.random = random.Random(seed)
+        self.time = datetime.datetime(2024, 5, 26, 17, 0, 0)
+        self.players = [self.name(unicode_ratio) + str(i) for i in range(players)]
+
+    def name(self, unicode_ratio):
+        names = UNICODE_NAMES if self.random.random() < unicode_ratio else ASCII_NAMES
+        return self.random.choice(names)
+
+    def timestamp(self):
+        self.time += datetime.timedelta(milliseconds=self.random.randint(0, 40))
+        return '<%s.%03dZ>' % (self.time.strftime('%Y-%m-%dT%H:%M:%S'), self.time.microsecond // 1000)
+
+    def fill(self, template):
+        r = self.random
+        return template.format(n=r.randint(1, 10 ** 12), m=r.randint(0, 999), hex='%016x' % r.getrandbits(64),
+                               player=r.choice(self.players))
+
+    def kill_line(self):
+        r = self.random
+        victim = r.choice(self.players)
+        zone = self.fill(r.choice(ZONES))
+        if r.random() < 0.15:
+            return "[Notice] <Actor Death> CActor::Kill: '%s' [%d] in zone '%s' [Team_ActorTech][Actor]" % (
+                victim, r.randint(1, 10 ** 12), zone)
+        return ("[Notice] <Actor Death> CActor::Kill: '%s' [%d] in zone '%s' killed by '%s' [%d] using '%s' "
+                "[Class unknown] with damage type '%s' from direction x: 0.%d, y: 0.%d, z: 0.%d "
+                "[Team_ActorTech][Actor]") % (
+            victim, r.randint(1, 10 ** 12), zone, r.choice(self.players), r.randint(1, 10 ** 12),
+            self.fill(r.choice(WEAPONS)), r.choice(DAMAGE_TYPES), r.randint(0, 999), r.randint(0, 999),
+            r.randint(0, 999))
+
+    def event_line(self):
+        r = self.random
+        if r.random() < 0.5:
+            return ("[Notice] <Vehicle Destruction> CVehicle::OnAdvanceDestroyLevel: Vehicle '%s' [%d] in zone "
+                    "'%s' [pos x: 1.0, y: 2.0, z: 3.0 vel x: 0, y: 0, z: 0] driven by '%s' [%d] advanced from "
+                    "destroy level 0 to 1 caused by '%s' [%d] with 'Combat' [Team_VehicleFeatures][Vehicle]") % (
+                self.fill(r.choice(ZONES[2:])), r.randint(1, 10 ** 12), self.fill(r.choice(ZONES)),
+                r.choice(self.players), r.randint(1, 10 ** 12), r.choice(self.players), r.randint(1, 10 ** 12))
+        return "[Notice] <Quantum Drive Arrived> Ship '%s' arrived to 'Stanton2_Crusader'" % self.fill(
+            r.choice(ZONES[2:]))
+
+    def noise_line(self):
+        line = self.fill(self.random.choice(NOISE_TEMPLATES))
+        if len(line) < self.line_length:
+            line += ' ' + 'x' * (self.line_length - len(line))
+        return line
+
+    def lines(self):
+        r = self.random
+        yield '%s Log started on %s' % (self.timestamp(), self.time.strftime('%a %b %d %H:%M:%S %Y'))
+        while True:
+            roll = r.random()
+            if roll < self.kill_density:
+                body = self.kill_line()
+            elif r.random() < self.noise_ratio:
+                body = self.noise_line()
+            else:
+                body = self.event_line()
+            yield '%s %s' % (self.timestamp(), body)
+
+
+def generate_log(path, size, **options):
+    # Writes about size bytes of log to path; returns (lines, kills)
+    generator = LogGenerator(**options)
+    written = 0
+    lines = 0
+    kills = 0
+    with open(path, 'wb') as f:
+        for line in generator.lines():
+            data = (line + '\r\n').encode('utf-8')
+            f.write(data)
+            written += len(data)
+            lines += 1
+            if '<Actor Death>' in line:
+                kills += 1
+            if written >= size:
+                break
+    return lines, kills
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Star Citizen Game.log")
+    parser.add_argument('path')
+    parser.add_argument('--size', type=float, default=50, help="Size in MB")
+    parser.add_argument('--kill-density', type=float, default=0.001)
+    parser.add_argument('--noise-ratio', type=float, default=0.95)
+    parser.add_argument('--line-length', type=int, default=160)
+    parser.add_argument('--unicode-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    lines, kills = generate_log(
+        args.path, int(args.size * 1024 * 1024), kill_density=args.kill_density,
+        noise_ratio=args.noise_ratio, line_length=args.line_length, unicode_ratio=args.unicode_ratio,
+        seed=args.seed)
+    print(f"Wrote {lines} lines with {kills} kills to {args.path}")
+
+
+if __name__ == '__main__':
+    main()
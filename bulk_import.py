@@ -0,0 +1,113 @@
+import heapq
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from checkpoint import log_key
+from kill_store import KillStore
+from log_parser import ACTOR_DEATH_TAG
+from scanner import scan_events
+
+BACKUP_DIR = 'logbackups'
+INSERT_BATCH_SIZE = 5000
+
+
+def find_backup_logs(log_path):
+    # Star Citizen rotates old sessions into logbackups/ next to Game.log
+    folder = os.path.join(os.path.dirname(log_path), BACKUP_DIR)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                  if name.lower().endswith('.log'))
+
+
+def scan_log(path):
+    # Runs in a worker process. Jumps from one '<Actor Death>' to the next
+    # with bytes-level searches and only decodes those lines.
+    return path, [event for event in scan_events(path, tags=(ACTOR_DEATH_TAG,)) if event.kind == 'kill']
+
+
+class BulkImporter(threading.Thread):
+    # Imports the kills of every backup log into the kill store. Files are
+    # scanned by a process pool, one file per task, and the results are
+    # merged in time order before they are written. Logs already imported
+    # (recognized by their log key) are skipped. Progress is reported through
+    # the results queue as ('progress', message, fraction), followed by
+    # ('done', message, 1.0) or ('error', message, fraction).
+
+    def __init__(self, store_path, paths, workers=None):
+        super().__init__(daemon=True)
+        self.store_path = store_path
+        self.paths = paths
+        self.workers = workers
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        store = KillStore(self.store_path)
+        try:
+            self.import_logs(store)
+        except Exception as e:
+            self.results.put(('error', str(e), 0))
+        finally:
+            store.close()
+
+    def import_logs(self, store):
+        imported = store.imported_keys()
+        pending = {}
+        for path in self.paths:
+            try:
+                key = log_key(path)
+            except OSError:
+                continue
+            if key and key not in imported:
+                imported.add(key)
+                pending[path] = key
+
+        if not pending:
+            self.results.put(('done', "No new backup logs to import", 1.0))
+            return
+
+        per_file = []
+        errors = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(scan_log, path) for path in pending]
+            for done, future in enumerate(as_completed(futures), 1):
+                if self.cancelled.is_set():
+                    pool.shutdown(cancel_futures=True)
+                    return
+                try:
+                    path, kills = future.result()
+                except Exception as e:
+                    print(f"Error scanning backup log: {str(e)}")
+                    errors += 1
+                    continue
+                per_file.append((path, [(pending[path], kill) for kill in kills]))
+                self.results.put(('progress', f"Scanned {done}/{len(pending)} logs",
+                                  0.9 * done / len(pending)))
+
+        # Each file is already in log order, so a k-way merge puts everything in time order
+        merged = heapq.merge(*(kills for _, kills in per_file), key=lambda item: item[1].timestamp)
+        total = 0
+        while True:
+            batch = list(itertools.islice(merged, INSERT_BATCH_SIZE))
+            if not batch:
+                break
+            for key, group in itertools.groupby(batch, key=lambda item: item[0]):
+                store.add_kills(key, [kill for _, kill in group])
+            total += len(batch)
+            if self.cancelled.is_set():
+                return
+
+        for path, kills in per_file:
+            store.mark_imported(pending[path], path, len(kills))
+
+        message = f"Imported {total} kills from {len(per_file)} backup logs"
+        if errors:
+            message += f" ({errors} could not be read)"
+        self.results.put(('done', message, 1.0))
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+CHECKPOINT_VERSION = 2
+HEAD_SIZE = 4096  # Bytes hashed to recognize a log file across restarts
+
+
+def head_hash(path, size=HEAD_SIZE):
+    with open(path, 'rb') as f:
+        head = f.read(size)
+    return hashlib.sha1(head).hexdigest(), len(head)
+
+
+def log_key(path):
+    # Identifies one game session's log: a hash of its first line, which
+    # carries the session start time. It stays the same while the file grows
+    # and after the game moves it into logbackups. None while the game has
+    # not finished writing that line, so a new log is never keyed on a part.
+    with open(path, 'rb') as f:
+        head = f.read(HEAD_SIZE)
+    end = head.find(b'\n')
+    if end < 0 and len(head) < HEAD_SIZE:
+        return None
+    return hashlib.sha1(head[:end] if end >= 0 else head).hexdigest()
+
+
+def file_identity(path):
+    stat = os.stat(path)
+    digest, head_size = head_hash(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'head_hash': digest,
+        'head_size': head_size,
+    }
+
+
+class CheckpointStore:
+    # Sidecar file remembering, per log file, how far it has been processed.
+    # Kills found up to there are already in the kill store. An entry is only used while
+    # the log is still the same file: same first bytes, and not shorter or
+    # older than when it was saved. When the game starts a new Game.log the
+    # header changes and the entry is discarded. The local player is kept
+    # with it, since the login line is not read again when resuming.
+
+    def __init__(self, path):
+        self.path = path
+
+    def _read(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CHECKPOINT_VERSION:
+                    return data
+        except Exception as e:
+            print(f"Error reading checkpoint: {str(e)}")
+        return {'version': CHECKPOINT_VERSION, 'logs': {}}
+
+    def load(self, log_path):
+        # Returns (processed offset, local player or None), or None when there
+        # is no valid checkpoint
+        entry = self._read()['logs'].get(os.path.abspath(log_path))
+        if not entry:
+            return None
+        try:
+            stat = os.stat(log_path)
+            digest, _ = head_hash(log_path, entry['head_size'])
+        except OSError:
+            return None
+        if (digest != entry['head_hash'] or stat.st_size < entry['size']
+                or stat.st_mtime < entry['mtime']):
+            return None
+        return entry['offset'], entry.get('player')
+
+    def save(self, log_path, offset, player=None):
+        data = self._read()
+        entry = file_identity(log_path)
+        entry['offset'] = offset
+        entry['player'] = player
+        data['logs'][entry['path']] = entry
+
+        # Write to a temporary file first so a crash never leaves half a checkpoint
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+from events import event_dict
+
+DEFAULT_HOST = '127.0.0.1'
+CLIENT_BUFFER = 1000  # Events queued per client before the oldest are dropped
+HISTORY_SIZE = 10000  # Events of the current log kept for replay
+KEEPALIVE_SECONDS = 15
+
+
+class _Client:
+    # Bounded outgoing queue of one connection. When the client reads too
+    # slowly the oldest events are dropped, and the client is told how many.
+    # A replay is sent whole, outside that bound: it is already limited by
+    # the history size, and its gap notice must never be dropped.
+
+    def __init__(self, size):
+        self.queue = deque(maxlen=size)
+        self.replayed = []
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def push(self, item):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(item)
+        self.ready.set()
+
+    def replay(self, items):
+        # Replaces what is queued: the history already holds those events
+        self.queue.clear()
+        self.replayed = list(items)
+        self.ready.set()
+
+
+class EventServer:
+    # Broadcasts parsed events to local clients from an asyncio loop on its
+    # own thread, so neither the Tk thread nor the reader thread ever waits
+    # on a socket. Two optional protocols, both bound to localhost:
+    #
+    #   TCP: one JSON object per line. Sending "replay <offset>" re-sends the
+    #   held events after that byte offset, then continues live.
+    #   SSE: GET /events (or /events?since=<offset>) streams text/event-stream
+    #   with the offset as the event id, so a reconnecting browser resumes
+    #   through Last-Event-ID.
+    #
+    # Offsets are byte offsets in the current Game.log; the replay history
+    # starts over when a new log begins. A client asking for more than the
+    # history holds first gets a {"kind": "gap"} notice.
+
+    def __init__(self, tcp_port=None, sse_port=None, host=DEFAULT_HOST,
+                 client_buffer=CLIENT_BUFFER, history_size=HISTORY_SIZE, allow_origin=None):
+        self.host = host
+        # Web pages can only read the SSE stream from this origin; None keeps
+        # the browser's same-origin rule
+        self.allow_origin = allow_origin
+        self.tcp_port = tcp_port
+        self.sse_port = sse_port
+        self.client_buffer = client_buffer
+        self.history = deque(maxlen=history_size)  # (offset, kind, json text)
+        self._evicted = None  # Offset of the newest event dropped from the history
+        self.clients = set()
+        self.loop = None
+        self.thread = None
+        self._servers = []
+        self._started = threading.Event()
+        self.error = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._started.wait()
+        if self.error:
+            raise self.error
+
+    def stop(self):
+        if self.loop is not None and self.thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def publish(self, events, source=None):
+        # Called from any thread; source names the log the events came from
+        if self.loop is not None and events:
+            self.loop.call_soon_threadsafe(self._broadcast, events, source)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            if self.tcp_port is not None:
+                self._servers.append(self.loop.run_until_complete(
+                    asyncio.start_server(self._serve_tcp, self.host, self.tcp_port)))
+            if self.sse_port is not None:
+                self._servers.append(self.loop.run_until_complete(
+                    asyncio.start_server(self._serve_sse, self.host, self.sse_port)))
+        except OSError as e:
+            self.error = e
+            # The other protocol may already be listening
+            for server in self._servers:
+                server.close()
+                self.loop.run_until_complete(server.wait_closed())
+            self._servers = []
+            self._started.set()
+            self.loop.close()
+            return
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            for server in self._servers:
+                server.close()
+            # Let the connection handlers close their sockets
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def _broadcast(self, events, source=None):
+        for event in events:
+            if event.kind == 'session':
+                self.history.clear()  # Offsets start over in the new log
+                self._evicted = None
+            data = event_dict(event)
+            if source:
+                data['source'] = source
+            item = (event.offset, event.kind, json.dumps(data))
+            if len(self.history) == self.history.maxlen:
+                self._evicted = self.history[0][0]
+            self.history.append(item)
+            for client in self.clients:
+                client.push(item)
+
+    def _since(self, offset):
+        # Held events after offset, preceded by a gap notice when older ones
+        # were already dropped from the history
+        items = [item for item in self.history if item[0] > offset]
+        if self._evicted is not None and self._evicted > offset:
+            gap = json.dumps({'kind': 'gap', 'offset': self._evicted})
+            items.insert(0, (self._evicted, 'gap', gap))
+        return items
+
+    async def _send(self, client, writer, encode):
+        while True:
+            try:
+                await asyncio.wait_for(client.ready.wait(), KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                writer.write(encode(None))  # Keep-alive, also notices dead clients
+                await writer.drain()
+                continue
+            client.ready.clear()
+            if client.dropped:
+                notice = json.dumps({'kind': 'dropped', 'count': client.dropped})
+                client.dropped = 0
+                writer.write(encode((None, 'dropped', notice)))
+            items = client.replayed + list(client.queue)
+            client.replayed = []
+            client.queue.clear()
+            writer.write(b''.join(encode(item) for item in items))
+            await writer.drain()
+
+    async def _serve(self, reader, writer, client, encode, read_commands):
+        self.clients.add(client)
+        sender = asyncio.ensure_future(self._send(client, writer, encode))
+        tasks = [sender]
+        if read_commands:
+            tasks.append(asyncio.ensure_future(read_commands()))
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            pass  # Server shutting down
+        finally:
+            self.clients.discard(client)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _serve_tcp(self, reader, writer):
+        client = _Client(self.client_buffer)
+
+        def encode(item):
+            return b'\n' if item is None else item[2].encode('utf-8') + b'\n'
+
+        async def read_commands():
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return  # Client went away
+                parts = line.decode('utf-8', errors='replace').split()
+                if len(parts) == 2 and parts[0].lower() == 'replay' and parts[1].lstrip('-').isdigit():
+                    client.replay(self._since(int(parts[1])))
+
+        await self._serve(reader, writer, client, encode, read_commands)
+
+    async def _serve_sse(self, reader, writer):
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        lines = request.decode('latin-1').split('\r\n')
+        parts = lines[0].split()
+        url = urlsplit(parts[1]) if len(parts) >= 2 else None
+        if not url or parts[0] != 'GET' or url.path not in ('/', '/events'):
+            writer.write(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            writer.close()
+            return
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        since = parse_qs(url.query).get('since', [headers.get('last-event-id')])[0]
+
+        cors = f'Access-Control-Allow-Origin: {self.allow_origin}\r\n' if self.allow_origin else ''
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n'
+                     b'Connection: keep-alive\r\n' + cors.encode('latin-1') + b'\r\n')
+        client = _Client(self.client_buffer)
+        if since is not None and since.lstrip('-').isdigit():
+            client.replay(self._since(int(since)))
+
+        def encode(item):
+            if item is None:
+                return b': keep-alive\n\n'
+            offset, kind, text = item
+            event_id = f'id: {offset}\n' if offset is not None and kind != 'gap' else ''
+            return f'{event_id}event: {kind}\ndata: {text}\n\n'.encode('utf-8')
+
+        async def read_commands():
+            await reader.read()  # Returns when the client disconnects
+
+        await self._serve(reader, writer, client, encode, read_commands)
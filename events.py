@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+
+# Shown in place of the killer when a death has none
+SKILL_ISSUE = "SKILL ISSUE"
+
+# Every event carries the byte offset of the Game.log line it came from, so
+# consumers can always go back to the raw file for more context.
+
+class LogLine(namedtuple('LogLine', 'offset text')):
+    __slots__ = ()
+    kind = 'line'
+
+
+class KillEvent(namedtuple('KillEvent', 'offset victim killer zone timestamp weapon damage_type')):
+    __slots__ = ()
+    kind = 'kill'
+
+
+class VehicleDestructionEvent(namedtuple(
+        'VehicleDestructionEvent',
+        'offset vehicle zone driver from_level to_level caused_by cause timestamp')):
+    __slots__ = ()
+    kind = 'vehicle_destruction'
+
+
+class SpawnEvent(namedtuple('SpawnEvent', 'offset player spawnpoint action timestamp')):
+    __slots__ = ()
+    kind = 'spawn'
+
+
+class QuantumEvent(namedtuple('QuantumEvent', 'offset vehicle state destination timestamp')):
+    __slots__ = ()
+    kind = 'quantum'
+
+
+class DisconnectEvent(namedtuple('DisconnectEvent', 'offset reason timestamp')):
+    __slots__ = ()
+    kind = 'disconnect'
+
+
+class LoginEvent(namedtuple('LoginEvent', 'offset player timestamp')):
+    __slots__ = ()
+    kind = 'login'
+
+
+class SessionBoundaryEvent(namedtuple('SessionBoundaryEvent', 'offset reason')):
+    # The log was replaced or truncated: a new game session starts at offset
+    __slots__ = ()
+    kind = 'session'
+
+
+def event_dict(event):
+    # JSON-ready form of any event, with its kind
+    data = event._asdict()
+    data['kind'] = event.kind
+    return data
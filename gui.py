@@ -0,0 +1,1488 @@
+import tkinter as tk
+from tkinter import scrolledtext, ttk, messagebox, filedialog
+import os
+import json
+import queue
+import re
+import threading
+import time
+import webbrowser
+from watchdog.observers import Observer
+from tailer import read_lines_before
+from history import HistoryLoader
+from checkpoint import CheckpointStore, log_key
+from kill_store import KillStore, KillFilter
+from bulk_import import BulkImporter, find_backup_logs
+from log_view import LogView, DEFAULT_MAX_LINES
+from scheduler import Backoff, TailScheduler
+from hud import HudFeed
+from kill_table import KillTable
+from metrics import Metrics, format_snapshot
+from log_parser import log_timestamp
+from kill_stats import KillStats
+from monitor import LogMonitor
+from event_server import EventServer
+from log_index import LogIndex, MAX_RESULTS as MAX_SEARCH_RESULTS
+from line_filter import LineFilter, parse_terms
+from tailer import read_lines_from
+from sources import LogSource, find_sources
+from archive import SessionArchiver, DEFAULT_ARCHIVE_DIR, DEFAULT_CODEC
+
+CHECKPOINT_INTERVAL_MS = 30000
+UPDATE_MIN_INTERVAL = 0.016  # One frame while events are flowing
+UPDATE_MAX_INTERVAL = 0.1
+STATS_INTERVAL_MS = 1000
+LEADERBOARD_SIZE = 15
+SEARCH_CONTEXT_LINES = 10
+DEFAULT_STATS_LOG_INTERVAL = 10  # Seconds between lines of the optional stats JSONL file
+ALL_SOURCES = 'All'  # Source selector entry that merges every monitored log
+
+
+class Application(tk.Tk):
+    def __init__(self):
+        super().__init__()
+
+        self.title("Star Citizen Log Scanner")
+        self.geometry("1000x600")
+        self.minsize(800, 400)
+        
+        # Initialize variables before creating layout
+        self.config_file = os.path.join(os.path.expanduser('~'), 'sc_scanner_config.json')
+        self.checkpoints = CheckpointStore(os.path.join(os.path.expanduser('~'), 'sc_scanner_checkpoint.json'))
+        self.store = KillStore(os.path.join(os.path.expanduser('~'), 'sc_scanner_kills.db'))
+        self.config = {}
+        self.log_path = None
+        self.sources = {}  # Name -> LogSource, the selected log first
+        self.primary = None  # LogSource of the selected log
+        self.view_source = None  # Name of the source shown, None for all merged
+        self.scheduler = None
+        self.observer = None
+        self.importer = None
+        self.archiver = None
+        self._kills_refresh_id = None
+        self.metrics = Metrics()
+        self.merged_stats = KillStats()
+        self.leaderboard_window = None
+        self._leaderboard_version = None
+        self.stats_window = None
+        self._stats_logged = 0
+        
+        # Modern theme configurations
+        self.dark_theme = {
+            'bg': '#1a1b1e',
+            'fg': '#ffffff',
+            'select_bg': '#663399',
+            'select_fg': '#ffffff',
+            'tree_bg': '#2a2b2e',
+            'tree_fg': '#ffffff',
+            'button_bg': '#663399',
+            'button_fg': '#ffffff',
+            'text_bg': '#1a1b1e',
+            'text_fg': '#e2e8f0',
+            'frame_bg': '#2a2b2e',
+            'hover_bg': '#7a3db8',
+            'border': '#3b3b3b',
+            'alternate_row': '#222326'
+        }
+        
+        self.light_theme = {
+            'bg': '#ffffff',
+            'fg': '#1a1b1e',
+            'select_bg': '#3b82f6',
+            'select_fg': '#ffffff',
+            'tree_bg': '#f8fafc',
+            'tree_fg': '#1a1b1e',
+            'button_bg': '#3b82f6',
+            'button_fg': '#ffffff',
+            'text_bg': '#ffffff',
+            'text_fg': '#1a1b1e',
+            'frame_bg': '#f1f5f9',
+            'hover_bg': '#7a3db8',
+            'border': '#e2e8f0',
+            'alternate_row': '#f8fafc'
+        }
+        
+        self.current_theme = self.dark_theme
+        self.setup_styles()
+        self.create_layout()
+        
+        # Set up file monitoring
+        self.config_file = os.path.join(os.path.expanduser('~'), 'sc_scanner_config.json')
+        self.log_path = self.load_config()
+        self.log_view.max_lines = self.config.get('log_view_lines', DEFAULT_MAX_LINES)
+        self.load_log_filter()
+        self.event_server = None
+        self.search_window = None
+        self.start_event_server()
+        
+        # Add file selection button to controls
+        self.select_file_button = self.create_custom_button(
+            self.controls_frame,
+            "Select Log File",
+            self.select_log_file
+        )
+        self.select_file_button.pack(side='right', padx=5)
+        
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.update_backoff = Backoff(UPDATE_MIN_INTERVAL, UPDATE_MAX_INTERVAL)
+        self._updates_id = None
+        self.setup_file_monitoring()
+        self.check_updates()
+        self.after(CHECKPOINT_INTERVAL_MS, self.autosave_checkpoint)
+        self.after(STATS_INTERVAL_MS, self.update_stats)
+
+    def create_custom_button(self, parent, text, command):
+        btn = tk.Button(
+            parent,
+            text=text,
+            command=command,
+            bg=self.current_theme['button_bg'],
+            fg=self.current_theme['button_fg'],
+            relief='flat',
+            padx=15,
+            pady=5,
+            font=('Segoe UI', 9),
+            cursor='hand2'
+        )
+        btn.bind('<Enter>', lambda e: btn.configure(background=self.current_theme['hover_bg']))
+        btn.bind('<Leave>', lambda e: btn.configure(background=self.current_theme['button_bg']))
+        return btn
+
+    def setup_styles(self):
+        self.configure(bg=self.current_theme['bg'])
+        style = ttk.Style()
+        style.theme_use('default')
+
+        # Configure Treeview
+        style.configure('Treeview',
+            background=self.current_theme['tree_bg'],
+            foreground=self.current_theme['tree_fg'],
+            fieldbackground=self.current_theme['tree_bg'],
+            borderwidth=0)
+        
+        style.configure('Treeview.Heading',
+            background=self.current_theme['frame_bg'],
+            foreground=self.current_theme['fg'],
+            relief='flat',
+            font=('Segoe UI', 9, 'bold'))
+        
+        style.map('Treeview.Heading',
+            background=[('active', self.current_theme['frame_bg'])])
+            
+        style.configure('TLabelframe',
+            background=self.current_theme['frame_bg'],
+            bordercolor=self.current_theme['border'])
+        
+        style.configure('TLabelframe.Label',
+            background=self.current_theme['frame_bg'],
+            foreground=self.current_theme['fg'],
+            font=('Segoe UI', 9, 'bold'))
+            
+        # Configure alternating row colors
+        style.map('Treeview',
+            background=[('selected', self.current_theme['select_bg'])],
+            foreground=[('selected', self.current_theme['select_fg'])])
+
+    def create_tooltip(self, widget, text):
+        if self.tooltip:
+            self.tooltip.destroy()
+        
+        # Get mouse position relative to screen
+        x = self.winfo_pointerx() + 15
+        y = self.winfo_pointery() + 10
+        
+        self.tooltip = tk.Toplevel(self)
+        self.tooltip.wm_overrideredirect(True)
+        self.tooltip.wm_geometry(f"+{x}+{y}")
+        
+        label = tk.Label(
+            self.tooltip,
+            text=text,
+            justify='left',
+            background=self.current_theme['frame_bg'],
+            foreground=self.current_theme['fg'],
+            relief='solid',
+            borderwidth=1,
+            padx=5,
+            pady=2
+        )
+        label.pack()
+
+    def hide_tooltip(self, event=None):
+        if self.tooltip:
+            self.tooltip.destroy()
+            self.tooltip = None
+
+    def on_tree_motion(self, event):
+        item = self.kills_tree.identify_row(event.y)
+        if not item:
+            self.hide_tooltip()
+            return
+            
+        column = self.kills_tree.identify_column(event.x)
+        if column in ('#1', '#2'):  # Victim or Killer columns
+            self.create_tooltip(event.widget, "Click to open RSI profile")
+        else:
+            self.hide_tooltip()
+
+    def on_tree_motion(self, event):
+        item = self.kills_tree.identify_row(event.y)
+        column = self.kills_tree.identify_column(event.x)
+        
+        if item and column in ('#1', '#2'):  # Victim or Killer columns
+            self.kills_tree.configure(cursor='hand2')
+            self.create_tooltip(event.widget, "Click to open RSI profile")
+        else:
+            self.kills_tree.configure(cursor='')
+            self.hide_tooltip()
+
+    def on_tree_click(self, event):
+        item = self.kills_tree.identify_row(event.y)
+        if not item:
+            return
+            
+        column = self.kills_tree.identify_column(event.x)
+        if column not in ('#1', '#2'):  # Not Victim or Killer columns
+            return
+            
+        # Get the player name from the clicked cell
+        col_id = int(column[1]) - 1
+        player_name = self.kills_tree.item(item)['values'][col_id]
+        
+        # Open RSI profile in default browser
+        url = f"https://robertsspaceindustries.com/citizens/{player_name}"
+        webbrowser.open(url)
+
+    def toggle_theme(self):
+        self.current_theme = self.light_theme if self.current_theme == self.dark_theme else self.dark_theme
+        self.setup_styles()
+        
+        # Update text widget colors
+        self.log_text.configure(
+            bg=self.current_theme['text_bg'],
+            fg=self.current_theme['text_fg'],
+            insertbackground=self.current_theme['text_fg'],
+            selectbackground=self.current_theme['select_bg'],
+            selectforeground=self.current_theme['select_fg']
+        )
+        
+        # Update control buttons
+        for btn in [self.theme_button, self.clear_button, self.import_button, self.toggle_log_button,
+                    self.load_older_button, self.search_button, self.stats_button, self.leaderboard_button,
+                    self.filter_button, self.reset_filter_button]:
+            btn.configure(bg=self.current_theme['button_bg'], fg=self.current_theme['button_fg'])
+            
+        # Update tooltip if it exists
+        if self.tooltip:
+            for child in self.tooltip.winfo_children():
+                if isinstance(child, tk.Label):
+                    child.configure(
+                        background=self.current_theme['frame_bg'],
+                        foreground=self.current_theme['fg']
+                    )
+            
+        # Update filter bar colors
+        self.filter_bar.configure(bg=self.current_theme['frame_bg'])
+        self.log_tools.configure(bg=self.current_theme['frame_bg'])
+        for widget in self.filter_labels:
+            widget.configure(bg=self.current_theme['frame_bg'], fg=self.current_theme['fg'])
+
+        # Update tree colors
+        self.kills_tree.tag_configure('kill_even', background=self.current_theme['alternate_row'])
+        self.kills_tree.tag_configure('kill_odd', background=self.current_theme['tree_bg'])
+
+    def toggle_log_visibility(self):
+        if self.log_frame.winfo_viewable():
+            current_height = self.winfo_height()
+            log_height = self.log_frame.winfo_height()
+            self.log_frame.pack_forget()
+            self.toggle_log_button.configure(text="Show Log")
+            # Adjust window size when hiding log
+            self.geometry(f"{self.winfo_width()}x{current_height - log_height}")
+        else:
+            self.log_frame.pack(expand=True, fill='both', padx=10, pady=(0, 10))
+            self.toggle_log_button.configure(text="Hide Log")
+
+    def clear_kills_log(self):
+        if messagebox.askyesno("Confirm Clear", 
+            "Are you sure you want to clear the kills log?\nThis action cannot be undone.",
+            icon='warning'):
+            # The kills go, but the session can first be kept as a compressed
+            # archive of the log with its events
+            paths = [source.path for source in self.view_sources() if os.path.exists(source.path)]
+            if paths and not self.archiver and messagebox.askyesno(
+                    "Archive Session",
+                    "Archive the current log before clearing?\n"
+                    "The log and its events are stored compressed in\n"
+                    f"{self.config.get('archive_dir', DEFAULT_ARCHIVE_DIR)}"):
+                self.archive_logs(paths)
+
+            # Kills of the current logs shown are removed from the store for good
+            for source in self.view_sources():
+                if source.log_key:
+                    self.store.delete_log(source.log_key)
+                source.kill_stats.clear()
+            self.save_checkpoint()
+            self.refresh_kills()
+            self.hud_feed.clear()
+            self.seed_merged_stats()
+
+    def create_layout(self):
+        # Create controls frame at the top
+        self.controls_frame = tk.Frame(self, bg=self.current_theme['bg'])
+        self.controls_frame.pack(fill='x', padx=10, pady=(5, 0))
+        
+        # Add control buttons with modern style
+        self.theme_button = self.create_custom_button(
+            self.controls_frame,
+            "Toggle Theme",
+            self.toggle_theme
+        )
+        self.theme_button.pack(side='left', padx=(0, 5))
+
+        self.pause_button = self.create_custom_button(
+            self.controls_frame,
+            "Pause Log",
+            self.toggle_pause
+        )
+        self.pause_button.pack(side='left', padx=5)
+        self.log_paused = False
+        
+        self.hud_button = self.create_custom_button(
+            self.controls_frame,
+            "Pop HUD",
+            self.toggle_hud
+        )
+        self.hud_button.pack(side='left', padx=5)
+        self.hud_window = None
+        self.hud_feed = HudFeed()
+        
+        self.clear_button = self.create_custom_button(
+            self.controls_frame,
+            "Clear Kills Log",
+            self.clear_kills_log
+        )
+        self.clear_button.pack(side='left', padx=5)
+
+        self.import_button = self.create_custom_button(
+            self.controls_frame,
+            "Import Backups",
+            self.import_backups
+        )
+        self.import_button.pack(side='left', padx=5)
+        
+        self.toggle_log_button = self.create_custom_button(
+            self.controls_frame,
+            "Hide Log",
+            self.toggle_log_visibility
+        )
+        self.toggle_log_button.pack(side='left', padx=5)
+
+        self.stats_button = self.create_custom_button(
+            self.controls_frame,
+            "Show Stats",
+            self.toggle_stats
+        )
+        self.stats_button.pack(side='left', padx=5)
+
+        self.leaderboard_button = self.create_custom_button(
+            self.controls_frame,
+            "Leaderboard",
+            self.toggle_leaderboard
+        )
+        self.leaderboard_button.pack(side='left', padx=5)
+        
+        # Add file selection button
+        self.select_file_button = self.create_custom_button(
+            self.controls_frame,
+            "Select Log File",
+            self.select_log_file
+        )
+        self.select_file_button.pack(side='right', padx=5)
+
+        # LIVE, PTU, ... or all of them merged; switching only redraws
+        self.source_var = tk.StringVar(value=ALL_SOURCES)
+        self.source_box = ttk.Combobox(
+            self.controls_frame,
+            textvariable=self.source_var,
+            values=(ALL_SOURCES,),
+            state='readonly',
+            width=14
+        )
+        self.source_box.pack(side='right', padx=5)
+        self.source_box.bind('<<ComboboxSelected>>', self.select_source)
+        tk.Label(
+            self.controls_frame,
+            text="Source",
+            bg=self.current_theme['bg'],
+            fg=self.current_theme['fg'],
+            font=('Segoe UI', 9)
+        ).pack(side='right')
+
+        # Create kills frame
+        self.kills_frame = ttk.LabelFrame(self, text="Kills Log")
+        self.kills_frame.pack(fill='both', padx=10, pady=(0, 10), ipady=5)
+
+        # Create kills treeview with modern styling
+        self.kills_tree = ttk.Treeview(
+            self.kills_frame, 
+            columns=('Victim', 'Killer', 'Time', 'Zone'), 
+            show='headings',
+            style='Treeview',
+            height=4  # Show only 4 rows by default
+        )
+        
+        # Configure modern headings
+        headings = {
+            'Victim': 'Victim',
+            'Killer': 'Killed By',
+            'Time': 'Time',
+            'Zone': 'Zone / Vehicle'
+        }
+        
+        for col in headings:
+            self.kills_tree.heading(col, 
+                text=headings[col],
+                anchor='w' if col not in ('Time',) else 'center')
+        
+        # Configure columns with modern proportions
+        self.kills_tree.column('Victim', width=300, minwidth=200)
+        self.kills_tree.column('Killer', width=300, minwidth=200)
+        self.kills_tree.column('Time', width=100, minwidth=100, anchor='center')
+        self.kills_tree.column('Zone', width=250, minwidth=150)
+        
+        # Configure clickable names and special tags
+        self.kills_tree.tag_configure('clickable', foreground=self.current_theme['select_bg'])
+        self.kills_tree.tag_configure('skill_issue', foreground='#FF5555')  # Bright red for skill issue
+        self.kills_tree.bind('<Button-1>', self.on_tree_click)
+        
+        # Add tooltip
+        self.tooltip = None
+        self.kills_tree.bind('<Motion>', self.on_tree_motion)
+        self.kills_tree.bind('<Leave>', self.hide_tooltip)
+        
+        # Configure row tags for alternating colors
+        self.kills_tree.tag_configure('kill_even', background=self.current_theme['alternate_row'])
+        self.kills_tree.tag_configure('kill_odd', background=self.current_theme['tree_bg'])
+        
+        self.create_kill_filters()
+        self.kills_scrollbar = ttk.Scrollbar(self.kills_frame, orient='vertical')
+        self.kills_scrollbar.pack(side='right', fill='y', pady=5)
+        self.kills_tree.pack(expand=True, fill='both', padx=(5, 0), pady=5)
+
+        # Only the visible rows exist in the Treeview, the rest stays in the store
+        self.kill_table = KillTable(self.kills_tree, self.kills_scrollbar, self.store,
+                                    on_change=self.update_kills_title, metrics=self.metrics)
+
+        # Create log frame
+        self.log_frame = ttk.LabelFrame(self, text="Full Log")
+        self.log_frame.pack(expand=True, fill='both', padx=10, pady=(0, 10))
+
+        self.log_tools = log_tools = tk.Frame(self.log_frame, bg=self.current_theme['frame_bg'])
+        log_tools.pack(fill='x', padx=5, pady=(5, 0))
+        self.load_older_button = self.create_custom_button(
+            log_tools,
+            "Load Older Lines",
+            self.load_older_log
+        )
+        self.load_older_button.pack(side='right')
+        self.search_button = self.create_custom_button(
+            log_tools,
+            "Search",
+            self.toggle_search
+        )
+        self.search_button.pack(side='right', padx=5)
+        self.create_log_filters(log_tools)
+
+        # Create main text area with modern theme
+        self.log_text = scrolledtext.ScrolledText(
+            self.log_frame,
+            wrap=tk.WORD,
+            bg=self.current_theme['text_bg'],
+            fg=self.current_theme['text_fg'],
+            insertbackground=self.current_theme['text_fg'],
+            selectbackground=self.current_theme['select_bg'],
+            selectforeground=self.current_theme['select_fg'],
+            font=('Consolas', 10),
+            relief='flat',
+            borderwidth=0,
+            padx=10,
+            pady=10
+        )
+        self.log_text.pack(expand=True, fill='both', padx=5, pady=5)
+
+        # Only the newest lines live in the widget, older ones are paged in on demand
+        self.log_view = LogView(self.log_text, metrics=self.metrics)
+
+    def create_kill_filters(self):
+        self.filter_bar = tk.Frame(self.kills_frame, bg=self.current_theme['frame_bg'])
+        self.filter_bar.pack(fill='x', padx=5, pady=(5, 0))
+        self.filter_labels = []
+        self.filter_vars = {}
+
+        for key, label, width in (('player', 'Player', 18), ('zone', 'Zone', 18),
+                                  ('since', 'From', 19), ('until', 'To', 19)):
+            label_widget = tk.Label(
+                self.filter_bar,
+                text=label,
+                bg=self.current_theme['frame_bg'],
+                fg=self.current_theme['fg'],
+                font=('Segoe UI', 9)
+            )
+            label_widget.pack(side='left', padx=(0, 2))
+            self.filter_labels.append(label_widget)
+
+            var = tk.StringVar()
+            entry = tk.Entry(self.filter_bar, textvariable=var, width=width, relief='flat')
+            entry.pack(side='left', padx=(0, 8))
+            entry.bind('<Return>', lambda e: self.apply_kill_filter())
+            self.filter_vars[key] = var
+
+        self.current_log_only = tk.BooleanVar(value=True)
+        self.current_log_check = tk.Checkbutton(
+            self.filter_bar,
+            text="Current log only",
+            variable=self.current_log_only,
+            command=self.apply_kill_filter,
+            bg=self.current_theme['frame_bg'],
+            fg=self.current_theme['fg'],
+            selectcolor=self.current_theme['tree_bg'],
+            activebackground=self.current_theme['frame_bg'],
+            font=('Segoe UI', 9)
+        )
+        self.current_log_check.pack(side='left', padx=(0, 8))
+        self.filter_labels.append(self.current_log_check)
+
+        self.reset_filter_button = self.create_custom_button(self.filter_bar, "Reset", self.reset_kill_filter)
+        self.reset_filter_button.pack(side='right')
+        self.filter_button = self.create_custom_button(self.filter_bar, "Filter", self.apply_kill_filter)
+        self.filter_button.pack(side='right', padx=5)
+
+    def create_log_filters(self, parent):
+        # Comma-separated terms: <Tag>, [Channel], /regex/ or plain text
+        self.log_filter_vars = {}
+        for key, label in (('log_include', 'Show'), ('log_exclude', 'Hide')):
+            label_widget = tk.Label(
+                parent,
+                text=label,
+                bg=self.current_theme['frame_bg'],
+                fg=self.current_theme['fg'],
+                font=('Segoe UI', 9)
+            )
+            label_widget.pack(side='left', padx=(0, 2))
+            self.filter_labels.append(label_widget)
+
+            var = tk.StringVar()
+            entry = tk.Entry(parent, textvariable=var, width=28, relief='flat')
+            entry.pack(side='left', padx=(0, 8))
+            entry.bind('<Return>', lambda e: self.apply_log_filter())
+            self.log_filter_vars[key] = var
+
+        self.log_filter_on = tk.BooleanVar(value=False)
+        log_filter_check = tk.Checkbutton(
+            parent,
+            text="Filter",
+            variable=self.log_filter_on,
+            command=self.apply_log_filter,
+            bg=self.current_theme['frame_bg'],
+            fg=self.current_theme['fg'],
+            selectcolor=self.current_theme['tree_bg'],
+            activebackground=self.current_theme['frame_bg'],
+            font=('Segoe UI', 9)
+        )
+        log_filter_check.pack(side='left')
+        self.filter_labels.append(log_filter_check)
+
+        # Runs of repeated lines show as one row with a counter
+        self.log_collapse = tk.BooleanVar(value=True)
+        collapse_check = tk.Checkbutton(
+            parent,
+            text="Collapse repeats",
+            variable=self.log_collapse,
+            command=self.apply_log_collapse,
+            bg=self.current_theme['frame_bg'],
+            fg=self.current_theme['fg'],
+            selectcolor=self.current_theme['tree_bg'],
+            activebackground=self.current_theme['frame_bg'],
+            font=('Segoe UI', 9)
+        )
+        collapse_check.pack(side='left', padx=(8, 0))
+        self.filter_labels.append(collapse_check)
+
+    def load_log_filter(self):
+        for key, var in self.log_filter_vars.items():
+            var.set(', '.join(self.config.get(key, [])))
+        self.log_filter_on.set(self.config.get('log_filter_on', False))
+        self.log_collapse.set(self.config.get('log_collapse', True))
+        self.log_view.collapse = self.log_collapse.get()
+        self.apply_log_filter(save=False)
+
+    def apply_log_collapse(self):
+        self.log_view.set_collapse(self.log_collapse.get())
+        self.config['log_collapse'] = self.log_collapse.get()
+        self.save_config()
+
+    def apply_log_filter(self, save=True):
+        include = parse_terms(self.log_filter_vars['log_include'].get())
+        exclude = parse_terms(self.log_filter_vars['log_exclude'].get())
+        if self.log_filter_on.get():
+            try:
+                line_filter = LineFilter(include, exclude)
+            except re.error as e:
+                messagebox.showerror("Log Filter", f"Invalid regular expression: {str(e)}")
+                return
+        else:
+            line_filter = None
+        self.log_view.set_filter(line_filter)
+        if save:
+            self.config.update(log_include=include, log_exclude=exclude,
+                               log_filter_on=self.log_filter_on.get())
+            self.save_config()
+
+    def apply_kill_filter(self):
+        values = {key: var.get().strip() for key, var in self.filter_vars.items()}
+        self.kill_table.set_filter(KillFilter(
+            log_keys=[s.log_key for s in self.view_sources()] if self.current_log_only.get() else None,
+            **values
+        ))
+
+    def reset_kill_filter(self):
+        for var in self.filter_vars.values():
+            var.set('')
+        self.apply_kill_filter()
+
+    def load_config(self):
+        default_path = r"C:\Program Files\Roberts Space Industries\StarCitizen\LIVE\Game.log"
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r') as f:
+                    self.config = json.load(f)
+        except Exception:
+            pass
+        return self.config.get('log_path', default_path)
+
+    def save_config(self):
+        try:
+            self.config['log_path'] = self.log_path
+            with open(self.config_file, 'w') as f:
+                json.dump(self.config, f)
+        except Exception as e:
+            print(f"Error saving config: {str(e)}")
+
+    def select_log_file(self):
+        file_path = filedialog.askopenfilename(
+            title="Select Star Citizen Game.log file",
+            filetypes=[("Log files", "*.log"), ("All files", "*.*")],
+            initialdir=os.path.dirname(self.log_path)
+        )
+        if file_path:
+            self.log_path = file_path
+            self.save_config()
+            self.restart_monitoring()
+
+    def stop_monitoring(self):
+        self.save_checkpoint()
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+        for source in self.sources.values():
+            if source.history_loader:
+                source.history_loader.cancel()
+                source.history_loader = None
+            if source.monitor:
+                source.monitor.stop()
+                source.monitor = None
+            if source.log_index:
+                source.log_index.stop()
+                source.log_index = None
+        self.update_kills_title()
+
+    def restart_monitoring(self):
+        self.stop_monitoring()
+        # Clear existing content
+        self.log_view.clear()
+        self.setup_file_monitoring()
+
+    def setup_file_monitoring(self):
+        if not self.log_path or not os.path.exists(self.log_path):
+            self.sources = {}
+            self.primary = None
+            self.update_source_choices()
+            self.log_view.write_message("Please select the Star Citizen Game.log file using the 'Select Log File' button.")
+            self.apply_kill_filter()
+            return
+
+        # The selected log and those of the other installed environments are
+        # all followed, sharing one reader thread and one observer
+        self.sources = {name: LogSource(name, path) for name, path in find_sources(self.log_path).items()}
+        self.primary = next(iter(self.sources.values()))
+        self.update_source_choices()
+        self.scheduler = TailScheduler()
+        initial = [(source, self.start_source(source)) for source in self.sources.values()]
+        self.apply_kill_filter()
+
+        # Statistics start from what the store already has for these logs, in
+        # time order; from here on they are only updated per event
+        for source in self.sources.values():
+            source.kill_stats.clear()
+            if not source.log_key:
+                continue
+            for kill in self.store.iter_kills(KillFilter(log_key=source.log_key)):
+                source.kill_stats.add_kill(kill)
+        self.seed_merged_stats()
+        for source, events in initial:
+            for event in events:
+                self.add_stats_event(source, event)
+
+        # Seed the HUD with the latest kills of these logs
+        self.hud_feed.clear()
+        self.hud_feed.push(reversed(self.store.query(
+            KillFilter(log_keys=[s.log_key for s in self.sources.values()]), limit=self.hud_feed.size)))
+
+        # Set up watchdog observer, one watch per log folder
+        try:
+            self.observer = Observer()
+            for source in self.sources.values():
+                if source.monitor:
+                    self.observer.schedule(source.monitor, os.path.dirname(source.path), recursive=False)
+            self.observer.start()
+        except Exception as e:
+            self.log_view.write_message(f"Error setting up file monitoring: {str(e)}")
+
+        # Without notifications the reader thread still polls
+        if self.log_paused:
+            self.scheduler.pause()
+        self.scheduler.start()
+
+    def start_source(self, source):
+        # Reads the end of one log and starts tailing it; returns the events read
+        try:
+            source.monitor = LogMonitor(source.path, metrics=self.metrics, source=source.name,
+                                        scheduler=self.scheduler)
+
+            # Kills found by a previous run on this same log are already stored
+            cached_end, player = self.checkpoints.load(source.path) or (0, None)
+            if player:
+                source.kill_stats.me = player
+
+            # Show only the end of the log and start tailing from there right away
+            size = os.path.getsize(source.path)
+            lines, stop = read_lines_before(source.path, size, self.log_view.max_lines)
+            tail_start = lines[0][0] if lines else stop
+            source.monitor.tailer.seek(tail_start)
+            events, source.monitor.position = source.monitor.read_events(stop - tail_start)
+            self.update_log_key(source)
+            self.log_view.append([e for e in events if e.kind == 'line'], source.name)
+            self.store.add_kills(source.log_key, [e for e in events if e.kind == 'kill'])
+
+            # Whatever the checkpoint does not cover is parsed in the background
+            if cached_end < tail_start:
+                self.start_backfill(source, cached_end, tail_start)
+        except Exception as e:
+            self.log_view.write_message(f"Error reading {source.name} log file: {str(e)}", source.name)
+            if source.monitor:
+                source.monitor.stop()
+                source.monitor = None
+            return []
+
+        source.monitor.start()
+
+        # The search index builds in the background and then follows the log
+        source.log_index = LogIndex(source.path)
+        source.log_index.start()
+        return events
+
+    def update_source_choices(self):
+        self.source_box.configure(values=[ALL_SOURCES] + list(self.sources))
+        if self.view_source not in self.sources:
+            self.view_source = None
+        self.source_var.set(self.view_source or ALL_SOURCES)
+        self.log_view.paths = {name: source.path for name, source in self.sources.items()}
+        self.log_view.show_source(self.view_source)
+
+    def select_source(self, event=None):
+        # Every source keeps its own lines, kills and statistics, so
+        # switching only redraws from memory
+        choice = self.source_var.get()
+        self.view_source = choice if choice in self.sources else None
+        self.log_view.show_source(self.view_source)
+        self.apply_kill_filter()
+        self._leaderboard_version = None
+        self.update_leaderboard()
+        self.update_hud_stats()
+
+    def view_sources(self):
+        # Sources in the current view
+        if self.view_source in self.sources:
+            return [self.sources[self.view_source]]
+        return list(self.sources.values())
+
+    @property
+    def kill_stats(self):
+        # Statistics of the source shown, or of all of them together
+        source = self.sources.get(self.view_source)
+        return source.kill_stats if source else self.merged_stats
+
+    def seed_merged_stats(self):
+        # Sum of the per-source statistics, so vehicle destructions are kept
+        # and a new session or a clear never rescans the store
+        self.merged_stats.merge(source.kill_stats for source in self.sources.values())
+        if self.primary:
+            self.merged_stats.me = self.primary.kill_stats.me
+
+    def start_backfill(self, source, start, end):
+        source.history_loader = HistoryLoader(source.path, end, start=start)
+        source.history_loader.start()
+        self.update_kills_title(0)
+        self.after(50, self.poll_history, source, source.history_loader)
+
+    def backfilling(self):
+        return any(source.history_loader for source in self.sources.values())
+
+    def poll_history(self, source, loader):
+        if loader is not source.history_loader:
+            return  # Cancelled or replaced by a restart
+
+        # A few batches per tick keeps the window responsive
+        for _ in range(4):
+            try:
+                status, payload, progress = loader.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if status == 'batch':
+                # History is older than anything shown, so the table is re-queried
+                kills = [e for e in payload if e.kind == 'kill']
+                with self.metrics.timer('store'):
+                    kills = self.store.add_kills(source.log_key, kills)
+                # Older than the kills already counted, so no streaks. Kills a
+                # previous run stored without checkpointing are counted already.
+                for stats in (source.kill_stats, self.merged_stats):
+                    for kill in kills:
+                        stats.add_kill(kill, ordered=False)
+                for event in payload:
+                    self.add_stats_event(source, event)
+                self.schedule_kills_refresh()
+                self.update_kills_title(progress)
+            else:
+                if status == 'error':
+                    self.log_view.write_message(f"Error loading {source.name} log history: {payload}", source.name)
+                source.history_loader = None
+                self.schedule_kills_refresh()
+                return
+
+        self.after(50, self.poll_history, source, loader)
+
+    def start_event_server(self):
+        # Optional: set 'event_server_tcp_port' and/or 'event_server_sse_port' in the config
+        tcp_port = self.config.get('event_server_tcp_port')
+        sse_port = self.config.get('event_server_sse_port')
+        if tcp_port is None and sse_port is None:
+            return
+        server = EventServer(tcp_port=tcp_port, sse_port=sse_port,
+                             allow_origin=self.config.get('event_server_allow_origin'))
+        try:
+            server.start()
+            self.event_server = server
+        except OSError as e:
+            self.log_view.write_message(f"Error starting event server: {str(e)}")
+
+    def update_log_key(self, source):
+        # A log has no key until its first line is complete; returns True
+        # when it just became known
+        if source.log_key is not None:
+            return False
+        try:
+            source.log_key = log_key(source.path)
+        except OSError:
+            return False
+        return source.log_key is not None
+
+    def handle_events(self, source, events):
+        if self.update_log_key(source):
+            # Kills of this new log can be stored and shown from now on
+            self.apply_kill_filter()
+        # Replay offsets refer to one file, so only the selected log is served
+        if self.event_server and source is self.primary:
+            self.event_server.publish([e for e in events if e.kind != 'line'], source.name)
+        lines = []
+        kills = []
+        for event in events:
+            if event.kind == 'line':
+                lines.append(event)
+            elif event.kind == 'kill':
+                kills.append(event)
+            elif event.kind == 'session':
+                # Everything before the boundary belongs to the previous log
+                self.flush_events(source, lines, kills)
+                lines, kills = [], []
+                self.start_new_session(source, event)
+            else:
+                self.add_stats_event(source, event)
+        self.flush_events(source, lines, kills)
+        self.record_display_lag(lines)
+
+    def add_stats_event(self, source, event):
+        # Events other than kills that feed the statistics
+        for stats in (source.kill_stats, self.merged_stats):
+            if event.kind == 'vehicle_destruction':
+                stats.add_vehicle_destruction(event)
+            elif event.kind == 'login':
+                stats.me = event.player
+
+    def record_display_lag(self, lines):
+        # How long ago the game wrote the newest line that is about to be
+        # drawn (the log view paints within a frame of this)
+        for line in reversed(lines):
+            stamp = log_timestamp(line.text)
+            if stamp is not None:
+                lag = max(0.0, time.time() - stamp[1])
+                self.metrics.observe('display_lag', lag)
+                self.metrics.gauge('display_lag_seconds', round(lag, 3))
+                return
+
+    def flush_events(self, source, lines, kills):
+        # The log view coalesces batches into one widget update per frame
+        if lines:
+            self.log_view.append(lines, source.name)
+        if kills:
+            self.add_kills(source, kills)
+
+    def start_new_session(self, source, event):
+        # The game replaced or truncated this Game.log; the tailer already
+        # continues from the start of the new file
+        if source.history_loader:
+            source.history_loader.cancel()
+            source.history_loader = None
+        self.log_view.start_new_file(source.name)
+        self.log_view.write_message(f"--- New game session (log {event.reason}) ---", source.name)
+        source.log_key = None
+        self.update_log_key(source)
+        source.kill_stats.clear()
+        self.seed_merged_stats()
+        self.apply_kill_filter()
+
+    def toggle_search(self):
+        if self.search_window and self.search_window.winfo_exists():
+            self.search_window.destroy()
+            self.search_window = None
+        else:
+            self.create_search_window()
+
+    def create_search_window(self):
+        self.search_window = tk.Toplevel(self)
+        self.search_window.title("Search Log")
+        self.search_window.configure(bg=self.current_theme['bg'])
+        self.search_window.geometry("900x600")
+        self.search_thread = None
+        self.search_cancel = None
+        self.search_source = None
+
+        bar = tk.Frame(self.search_window, bg=self.current_theme['bg'])
+        bar.pack(fill='x', padx=10, pady=(10, 5))
+        self.search_var = tk.StringVar()
+        entry = tk.Entry(bar, textvariable=self.search_var, relief='flat', font=('Consolas', 10))
+        entry.pack(side='left', fill='x', expand=True)
+        entry.bind('<Return>', lambda e: self.run_search())
+        entry.focus_set()
+        self.create_custom_button(bar, "Find", self.run_search).pack(side='left', padx=(5, 0))
+
+        self.search_status = tk.Label(
+            self.search_window,
+            anchor='w',
+            bg=self.current_theme['bg'],
+            fg=self.current_theme['fg'],
+            font=('Segoe UI', 9)
+        )
+        self.search_status.pack(fill='x', padx=10)
+
+        self.search_results = tk.Listbox(
+            self.search_window,
+            font=('Consolas', 9),
+            bg=self.current_theme['text_bg'],
+            fg=self.current_theme['text_fg'],
+            selectbackground=self.current_theme['select_bg'],
+            relief='flat',
+            height=15
+        )
+        self.search_results.pack(fill='both', expand=True, padx=10, pady=5)
+        self.search_results.bind('<<ListboxSelect>>', self.show_search_result)
+        self.search_offsets = []
+
+        # Lines around the selected result, read from the log by offset
+        self.search_context = scrolledtext.ScrolledText(
+            self.search_window,
+            wrap=tk.NONE,
+            height=12,
+            bg=self.current_theme['text_bg'],
+            fg=self.current_theme['text_fg'],
+            font=('Consolas', 9),
+            relief='flat'
+        )
+        self.search_context.tag_configure('found', background='#665500')
+        self.search_context.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+
+    def run_search(self):
+        # Searches the source shown, or the selected log in the merged view
+        query = self.search_var.get()
+        source = self.sources.get(self.view_source) or self.primary
+        if not query or not source or not source.log_index:
+            return
+        if self.search_cancel:
+            self.search_cancel.set()
+        self.search_cancel = threading.Event()
+        self.search_source = source
+        results = queue.Queue()
+        index = source.log_index
+        cancel = self.search_cancel
+        self.search_thread = threading.Thread(
+            target=lambda: results.put(index.search(query, cancelled=cancel)), daemon=True)
+        self.search_thread.start()
+        self.search_status.configure(
+            text=f"Searching {source.name} (log {int(index.progress() * 100)}% indexed)...")
+        self.after(50, self.poll_search, results, cancel)
+
+    def poll_search(self, results, cancel):
+        if cancel is not self.search_cancel or not (self.search_window and self.search_window.winfo_exists()):
+            return  # A newer search replaced this one, or the window was closed
+        try:
+            found = results.get_nowait()
+        except queue.Empty:
+            self.after(50, self.poll_search, results, cancel)
+            return
+        self.search_results.delete(0, tk.END)
+        self.search_offsets = [offset for offset, _ in found]
+        for _, text in found:
+            self.search_results.insert(tk.END, text[:300])
+        more = " (showing the first ones)" if len(found) >= MAX_SEARCH_RESULTS else ""
+        self.search_status.configure(text=f"{len(found)} matching lines{more}")
+
+    def show_search_result(self, event=None):
+        selection = self.search_results.curselection()
+        if not selection or not self.search_source:
+            return
+        offset = self.search_offsets[selection[0]]
+        path = self.search_source.path
+
+        # Jump there in the Full Log when the line is displayed
+        if self.log_view.log_path == path:
+            self.log_view.show_offset(offset)
+
+        before, _ = read_lines_before(path, offset, SEARCH_CONTEXT_LINES)
+        after = read_lines_from(path, offset, SEARCH_CONTEXT_LINES + 1)
+        context = self.search_context
+        context.delete('1.0', tk.END)
+        context.insert(tk.END, '\n'.join(text for _, text in before + after))
+        line = f'{len(before) + 1}.0'
+        context.tag_add('found', line, f'{line} lineend')
+        context.see(line)
+
+    def load_older_log(self):
+        if not self.log_view.load_older():
+            self.bell()
+
+    def add_kills(self, source, kills):
+        # One transaction for the batch, the table renders at most once per frame
+        with self.metrics.timer('store'):
+            new = self.store.add_kills(source.log_key, kills)
+        self.metrics.count('kills', len(kills))
+        self.kill_table.add(new, source.log_key)
+
+        # The HUD follows every kill, whatever the table filter or source shown
+        self.hud_feed.push(kills)
+        for stats in (source.kill_stats, self.merged_stats):
+            for kill in new:
+                stats.add_kill(kill)
+
+    def refresh_kills(self):
+        self._kills_refresh_id = None
+        self.kill_table.reload()
+
+    def schedule_kills_refresh(self):
+        if self._kills_refresh_id is None:
+            self._kills_refresh_id = self.after(250, self.refresh_kills)
+
+    def update_kills_title(self, progress=None):
+        if progress is None and self.backfilling():
+            return  # Keep showing the backfill progress
+        title = f"Kills Log ({self.kill_table.total})"
+        if progress is not None:
+            title += f" - loading history {int(progress * 100)}%"
+        self.kills_frame.configure(text=title)
+
+    def save_checkpoint(self):
+        # Only a fully parsed prefix of a log can be checkpointed
+        for source in self.sources.values():
+            if not source.monitor or source.history_loader:
+                continue
+            try:
+                # Only what the Tk side has consumed, queued events are not stored yet
+                self.checkpoints.save(source.path, source.monitor.position, source.kill_stats.me)
+            except Exception as e:
+                print(f"Error saving checkpoint: {str(e)}")
+
+    def autosave_checkpoint(self):
+        self.save_checkpoint()
+        self.after(CHECKPOINT_INTERVAL_MS, self.autosave_checkpoint)
+
+    def on_close(self):
+        if self.importer:
+            self.importer.cancel()
+        if self.archiver:
+            # A cancelled archive removes its partial file
+            self.archiver.cancel()
+            self.archiver.join(timeout=2)
+        self.stop_monitoring()
+        if self.event_server:
+            self.event_server.stop()
+        self.store.close()
+        self.destroy()
+
+    def import_backups(self):
+        if self.importer:
+            return  # Already running
+        paths = [path for source in self.sources.values() for path in find_backup_logs(source.path)]
+        if not paths:
+            messagebox.showinfo("Import Backups", "No backup logs found next to the monitored Game.log files.")
+            return
+
+        self.importer = BulkImporter(self.store.path, paths)
+        self.importer.start()
+        self.import_button.configure(text="Importing...")
+        self.after(200, self.poll_import)
+
+    def poll_import(self):
+        try:
+            while True:
+                status, message, progress = self.importer.results.get_nowait()
+                if status == 'progress':
+                    self.import_button.configure(text=f"Importing {int(progress * 100)}%")
+                    continue
+
+                self.importer = None
+                self.import_button.configure(text="Import Backups")
+                if status == 'error':
+                    message = f"Error importing backup logs: {message}"
+                self.log_view.write_message(message)
+                self.refresh_kills()
+                return
+        except queue.Empty:
+            pass
+        self.after(200, self.poll_import)
+
+    def archive_logs(self, paths):
+        # Optional: set 'archive_dir' and 'archive_codec' (lzma or zlib) in the config
+        self.archiver = SessionArchiver(paths, self.config.get('archive_dir', DEFAULT_ARCHIVE_DIR),
+                                        self.config.get('archive_codec', DEFAULT_CODEC))
+        self.archiver.start()
+        self.clear_button.configure(text="Archiving...")
+        self.after(200, self.poll_archive)
+
+    def poll_archive(self):
+        try:
+            while True:
+                status, message, progress = self.archiver.results.get_nowait()
+                if status == 'progress':
+                    self.clear_button.configure(text=f"Archiving {int(progress * 100)}%")
+                    continue
+
+                self.archiver = None
+                self.clear_button.configure(text="Clear Kills Log")
+                if status == 'error':
+                    message = f"Error archiving log: {message}"
+                self.log_view.write_message(message)
+                return
+        except queue.Empty:
+            pass
+        self.after(200, self.poll_archive)
+
+    def toggle_pause(self):
+        self.log_paused = not self.log_paused
+        if self.log_paused:
+            self.pause_button.configure(text="Resume Log")
+            if self.scheduler:
+                self.scheduler.pause()
+        else:
+            self.pause_button.configure(text="Pause Log")
+            if self.scheduler:
+                self.scheduler.resume()
+            if self._updates_id is None:
+                self.check_updates()
+            # Ensure we're at the end of the log when resuming
+            self.log_text.see(tk.END)
+
+    def toggle_stats(self):
+        if self.stats_window and self.stats_window.winfo_exists():
+            self.stats_window.destroy()
+            self.stats_window = None
+            self.stats_button.configure(text="Show Stats")
+        else:
+            self.create_stats_window()
+            self.stats_button.configure(text="Hide Stats")
+
+    def create_stats_window(self):
+        self.stats_window = tk.Toplevel(self)
+        self.stats_window.title("Pipeline Stats")
+        self.stats_window.configure(bg=self.current_theme['bg'])
+        self.stats_window.protocol('WM_DELETE_WINDOW', self.toggle_stats)
+        self.stats_label = tk.Label(
+            self.stats_window,
+            text="Collecting...",
+            justify='left',
+            anchor='nw',
+            bg=self.current_theme['bg'],
+            fg=self.current_theme['fg'],
+            font=('Consolas', 10),
+            padx=10,
+            pady=10
+        )
+        self.stats_label.pack(fill='both', expand=True)
+
+    def update_stats(self):
+        # Queue depths are sampled here; the counters and stage timings are
+        # recorded where the work happens
+        metrics = self.metrics
+        sources = self.sources.values()
+        metrics.gauge('reader_queue_batches', sum(s.monitor.events.qsize() for s in sources if s.monitor))
+        metrics.gauge('history_queue_batches',
+                      sum(s.history_loader.results.qsize() for s in sources if s.history_loader))
+        metrics.gauge('log_view_pending_lines', self.log_view.pending())
+        self.update_leaderboard()
+        self.update_hud_stats()
+
+        # Optional JSONL file, set 'stats_log' (and 'stats_log_interval') in the config
+        stats_log = self.config.get('stats_log')
+        interval = self.config.get('stats_log_interval', DEFAULT_STATS_LOG_INTERVAL)
+        # Sampled every tick so the rates always cover the last few seconds
+        snapshot = metrics.snapshot()
+        if self.stats_window is not None and self.stats_window.winfo_exists():
+            self.stats_label.configure(text=format_snapshot(snapshot))
+        if stats_log and snapshot['uptime'] - self._stats_logged >= interval:
+            self._stats_logged = snapshot['uptime']
+            try:
+                metrics.dump(stats_log, snapshot)
+            except Exception as e:
+                print(f"Error writing stats log: {str(e)}")
+        self.after(STATS_INTERVAL_MS, self.update_stats)
+
+    def toggle_leaderboard(self):
+        if self.leaderboard_window and self.leaderboard_window.winfo_exists():
+            self.leaderboard_window.destroy()
+            self.leaderboard_window = None
+        else:
+            self.create_leaderboard_window()
+            self.update_leaderboard()
+
+    def create_leaderboard_window(self):
+        self.leaderboard_window = tk.Toplevel(self)
+        self.leaderboard_window.title("Leaderboard")
+        self.leaderboard_window.configure(bg=self.current_theme['bg'])
+        self.leaderboard_window.geometry("560x480")
+        self._leaderboard_version = None
+
+        self.leaderboard_tree = ttk.Treeview(
+            self.leaderboard_window,
+            columns=('Player', 'Kills', 'Deaths', 'KD', 'Streak', 'Best'),
+            show='headings',
+            style='Treeview',
+            height=LEADERBOARD_SIZE
+        )
+        for col, text, width in (('Player', 'Player', 200), ('Kills', 'Kills', 60), ('Deaths', 'Deaths', 60),
+                                 ('KD', 'K/D', 60), ('Streak', 'Streak', 60), ('Best', 'Best Streak', 80)):
+            self.leaderboard_tree.heading(col, text=text, anchor='w' if col == 'Player' else 'center')
+            self.leaderboard_tree.column(col, width=width, anchor='w' if col == 'Player' else 'center')
+        self.leaderboard_tree.pack(fill='both', expand=True, padx=10, pady=(10, 5))
+
+        self.leaderboard_label = tk.Label(
+            self.leaderboard_window,
+            justify='left',
+            anchor='nw',
+            bg=self.current_theme['bg'],
+            fg=self.current_theme['fg'],
+            font=('Consolas', 9),
+            padx=10,
+            pady=5
+        )
+        self.leaderboard_label.pack(fill='x')
+
+    def update_leaderboard(self):
+        if not (self.leaderboard_window and self.leaderboard_window.winfo_exists()):
+            return
+        stats = self.kill_stats
+        if stats.version != self._leaderboard_version:
+            self._leaderboard_version = stats.version
+            self.leaderboard_tree.delete(*self.leaderboard_tree.get_children())
+            for name, player in stats.leaderboard(LEADERBOARD_SIZE):
+                self.leaderboard_tree.insert('', 'end', values=(
+                    name, player.kills, player.deaths, f"{player.kd:.2f}", player.streak, player.best_streak))
+
+        # Rates change with the clock, so the summary is redrawn every tick
+        rates = stats.kills_per_minute()
+        lines = [f"{stats.total} kills   kills/min " +
+                 '  '.join(f"{window}m: {rate:.1f}" for window, rate in rates.items())]
+        for title, counter in (('Zones', stats.zones), ('Weapons', stats.weapons),
+                               ('Vehicles destroyed this run', stats.vehicles)):
+            top = ', '.join(f"{name} ({count})" for name, count in counter.most_common(5))
+            lines.append(f"{title}: {top or '-'}")
+        self.leaderboard_label.configure(text='\n'.join(lines))
+
+    def update_hud_stats(self):
+        if not (self.hud_window and self.hud_window.winfo_exists()):
+            return
+        stats = self.kill_stats
+        rates = stats.kills_per_minute()
+        text = '  '.join(f"{window}m: {rate:.1f}/min" for window, rate in rates.items())
+        if stats.me and stats.me in stats.players:
+            me = stats.players[stats.me]
+            text = f"{me.kills}/{me.deaths}  K/D {me.kd:.2f}  streak {me.streak}   " + text
+        self.hud_stats_label.configure(text=text)
+
+    def toggle_hud(self):
+        if self.hud_window and self.hud_window.winfo_exists():
+            self.hud_feed.detach()
+            self.hud_window.destroy()
+            self.hud_window = None
+            self.hud_button.configure(text="Pop HUD")
+        else:
+            self.create_hud_window()
+            self.hud_button.configure(text="Close HUD")
+
+    def create_hud_window(self):
+        # Create a new toplevel window
+        self.hud_window = tk.Toplevel(self)
+        self.hud_window.title("Kill Feed HUD")
+        
+        # Make it frameless
+        self.hud_window.overrideredirect(True)
+        
+        # Set window attributes
+        self.hud_window.attributes('-topmost', True)  # Always on top
+        self.hud_window.attributes('-alpha', 0.85)    # Slight transparency
+        
+        # Create main frame with dark theme
+        main_frame = tk.Frame(
+            self.hud_window,
+            bg='#1a1b1e',
+            highlightthickness=1,
+            highlightbackground='#663399'  # Purple border
+        )
+        main_frame.pack(fill='both', expand=True)
+        
+        # Add a title bar
+        title_frame = tk.Frame(main_frame, bg='#663399')
+        title_frame.pack(fill='x')
+        
+        # Add title label
+        title_label = tk.Label(
+            title_frame,
+            text="Star Citizen Kill Feed",
+            bg='#663399',
+            fg='white',
+            font=('Segoe UI', 10, 'bold')
+        )
+        title_label.pack(side='left', padx=5, pady=2)
+        
+        # Add close button
+        close_btn = tk.Label(
+            title_frame,
+            text="×",
+            bg='#663399',
+            fg='white',
+            font=('Segoe UI', 10, 'bold'),
+            cursor='hand2'
+        )
+        close_btn.pack(side='right', padx=5, pady=2)
+        close_btn.bind('<Button-1>', lambda e: self.toggle_hud())
+        
+        # Create a treeview for kills
+        self.hud_tree = ttk.Treeview(
+            main_frame,
+            columns=('Victim', 'Killer', 'Time'),
+            show='headings',
+            style='Treeview',
+            height=5
+        )
+        
+        # Configure columns
+        self.hud_tree.heading('Victim', text='Victim')
+        self.hud_tree.heading('Killer', text='Killed By')
+        self.hud_tree.heading('Time', text='Time')
+        
+        self.hud_tree.column('Victim', width=150)
+        self.hud_tree.column('Killer', width=150)
+        self.hud_tree.column('Time', width=100)
+        
+        # Style the treeview
+        style = ttk.Style()
+        style.configure(
+            'Treeview',
+            background='#1a1b1e',
+            foreground='white',
+            fieldbackground='#1a1b1e'
+        )
+        style.configure(
+            'Treeview.Heading',
+            background='#2a2b2e',
+            foreground='white'
+        )
+        
+        self.hud_tree.pack(fill='both', expand=True, padx=5, pady=5)
+
+        # Own K/D and streak, plus recent kill rates
+        self.hud_stats_label = tk.Label(
+            main_frame,
+            text='',
+            bg='#1a1b1e',
+            fg='white',
+            font=('Segoe UI', 9),
+            anchor='w'
+        )
+        self.hud_stats_label.pack(fill='x', padx=5, pady=(0, 5))
+        
+        # Make window draggable
+        title_frame.bind('<Button-1>', self.start_drag)
+        title_frame.bind('<B1-Motion>', self.do_drag)
+        
+        # Position the window in the top-right corner initially
+        screen_width = self.winfo_screenwidth()
+        self.hud_window.geometry(f"+{screen_width-420}+10")
+        
+        # Configure tags for special styling
+        self.hud_tree.tag_configure('skill_issue', foreground='#FF5555')
+        
+        # Show the recent kills, new ones arrive through the feed
+        self.hud_feed.attach(self.hud_tree)
+        
+    def start_drag(self, event):
+        self._drag_data = {'x': event.x, 'y': event.y}
+
+    def do_drag(self, event):
+        if self.hud_window:
+            x = self.hud_window.winfo_x() + (event.x - self._drag_data['x'])
+            y = self.hud_window.winfo_y() + (event.y - self._drag_data['y'])
+            self.hud_window.geometry(f"+{x}+{y}")
+
+    def check_updates(self):
+        # Consumer side: everything queued since the last tick becomes one batch.
+        # Checks every frame while events flow and backs off when idle; while
+        # paused nothing is scheduled until toggle_pause resumes it.
+        self._updates_id = None
+        if self.log_paused:
+            return
+        busy = False
+        for source in self.sources.values():
+            if not source.monitor:
+                continue
+            try:
+                events = source.monitor.drain()
+                if events:
+                    busy = True
+                    self.handle_events(source, events)
+            except Exception as e:
+                print(f"Error updating log: {str(e)}")
+        interval = self.update_backoff.update(busy)
+        self._updates_id = self.after(int(interval * 1000), self.check_updates)
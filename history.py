@@ -0,0 +1,44 @@
+import queue
+import threading
+
+from scanner import scan_windows
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class HistoryLoader(threading.Thread):
+    # Parses the part of a log that was written before monitoring started,
+    # off the Tk thread. The scanner only decodes lines holding an event
+    # tag, so this takes the same memory whatever the size of the log.
+    # Parsed events are handed over in batches through the results queue as
+    # ('batch', events, progress), followed by a final ('done', None, 1.0)
+    # or ('error', message, progress).
+
+    def __init__(self, path, end, start=0, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(daemon=True)
+        self.path = path
+        self.start_offset = start  # Where a previous session's checkpoint ended
+        self.end = end  # Byte offset where live tailing took over
+        self.batch_size = batch_size
+        self.position = start
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def progress(self, position):
+        total = self.end - self.start_offset
+        return min(1.0, (position - self.start_offset) / total) if total > 0 else 1.0
+
+    def run(self):
+        try:
+            for events, self.position in scan_windows(self.path, self.start_offset, self.end):
+                # Every window reports progress, even one without events
+                for i in range(0, max(1, len(events)), self.batch_size):
+                    if self.cancelled.is_set():
+                        return
+                    self.results.put(('batch', events[i:i + self.batch_size], self.progress(self.position)))
+            self.results.put(('done', None, 1.0))
+        except Exception as e:
+            self.results.put(('error', str(e), self.progress(self.position)))
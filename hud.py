@@ -0,0 +1,65 @@
+from collections import deque
+
+from events import SKILL_ISSUE
+
+FRAME_MS = 16
+
+
+class HudFeed:
+    # Keeps the last few kills for the HUD overlay, fed straight from the kill
+    # event stream. While the HUD is open, new kills are applied as row diffs
+    # (evict the oldest rows, append the new ones) at most once per frame.
+
+    def __init__(self, size=5):
+        self.size = size
+        self.recent = deque(maxlen=size)
+        self.tree = None
+        self._queued = []
+        self._flush_id = None
+
+    def attach(self, tree):
+        self.detach()
+        self.tree = tree
+        tree.delete(*tree.get_children())
+        for kill in self.recent:
+            self._insert(kill)
+
+    def detach(self):
+        if self._flush_id is not None and self.tree is not None:
+            self.tree.after_cancel(self._flush_id)
+        self._flush_id = None
+        self._queued = []
+        self.tree = None
+
+    def clear(self):
+        self.recent.clear()
+        if self.tree is not None:
+            self.attach(self.tree)
+
+    def push(self, kills):
+        kills = list(kills)
+        self.recent.extend(kills)
+        if self.tree is None:
+            return
+        self._queued.extend(kills)
+        if self._flush_id is None:
+            self._flush_id = self.tree.after(FRAME_MS, self.flush)
+
+    def flush(self):
+        self._flush_id = None
+        # Only the newest kills of a burst can end up visible
+        queued = self._queued[-self.size:]
+        self._queued = []
+        rows = self.tree.get_children()
+        overflow = len(rows) + len(queued) - self.size
+        if overflow > 0:
+            self.tree.delete(*rows[:overflow])
+        for kill in queued:
+            self._insert(kill)
+
+    def _insert(self, kill):
+        # Oldest on top, newest at the bottom
+        if kill.killer is None:
+            self.tree.insert('', 'end', values=(kill.victim, SKILL_ISSUE, kill.timestamp), tags=('skill_issue',))
+        else:
+            self.tree.insert('', 'end', values=(kill.victim, kill.killer, kill.timestamp))
@@ -0,0 +1,127 @@
+import heapq
+import time
+from collections import Counter
+
+DEFAULT_WINDOWS = (1, 5, 15)  # Minutes for the kills-per-minute rates
+
+
+def _strip_id(name):
+    # 'AEGS_Gladius_2927163512' -> 'AEGS_Gladius', so ships and weapons group by type
+    if not name:
+        return 'unknown'
+    base, sep, tail = name.rpartition('_')
+    return base if sep and tail.isdigit() else name
+
+
+class PlayerStats:
+    __slots__ = ('kills', 'deaths', 'streak', 'best_streak')
+
+    def __init__(self):
+        self.kills = 0
+        self.deaths = 0
+        self.streak = 0  # Kills since the last death
+        self.best_streak = 0
+
+    @property
+    def kd(self):
+        return self.kills / self.deaths if self.deaths else float(self.kills)
+
+
+class KillStats:
+    # Running statistics for the current log, updated in O(1) per event so
+    # they never need a rescan of the kill store or the table. Streaks only
+    # make sense in time order: events passed with ordered=False (history
+    # that arrives after newer kills) update the counts but not the streaks.
+
+    def __init__(self, windows=DEFAULT_WINDOWS):
+        self.windows = windows
+        self.me = None  # The local player, from the login line
+        self.version = 0  # Bumped on every change so views can skip redraws
+        self.clear()
+
+    def clear(self):
+        self.players = {}
+        self.zones = Counter()
+        self.weapons = Counter()
+        self.vehicles = Counter()  # Destroyed vehicles by type; not stored, so only what this run read
+        self.total = 0
+        self.minutes = Counter()  # Minute number -> kills, only for the last max(windows) minutes
+        self._minute_cache = {}
+        self.version += 1
+
+    def player(self, name):
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = PlayerStats()
+        return stats
+
+    def add_kill(self, kill, ordered=True):
+        self.total += 1
+        victim = self.player(kill.victim)
+        victim.deaths += 1
+        if ordered:
+            victim.streak = 0
+        if kill.killer is not None and kill.killer != kill.victim:
+            killer = self.player(kill.killer)
+            killer.kills += 1
+            if ordered:
+                killer.streak += 1
+                if killer.streak > killer.best_streak:
+                    killer.best_streak = killer.streak
+        self.zones[_strip_id(kill.zone)] += 1
+        self.weapons[_strip_id(kill.weapon)] += 1
+
+        minute = self._minute(kill.timestamp)
+        if minute is not None and minute > time.time() // 60 - max(self.windows):
+            self.minutes[minute] += 1
+        self.version += 1
+
+    def merge(self, parts):
+        # Rebuilds these statistics as the sum of others, e.g. one per log,
+        # without going back to the store. Streaks of a player seen in
+        # several of them are the best of those.
+        self.clear()
+        for part in parts:
+            for name, stats in part.players.items():
+                player = self.player(name)
+                player.kills += stats.kills
+                player.deaths += stats.deaths
+                player.streak = max(player.streak, stats.streak)
+                player.best_streak = max(player.best_streak, stats.best_streak)
+            self.zones.update(part.zones)
+            self.weapons.update(part.weapons)
+            self.vehicles.update(part.vehicles)
+            self.minutes.update(part.minutes)
+            self.total += part.total
+        self.version += 1
+
+    def add_vehicle_destruction(self, event):
+        self.vehicles[_strip_id(event.vehicle)] += 1
+        self.version += 1
+
+    def _minute(self, timestamp):
+        # 'YYYY-MM-DD HH:MM:SS' local time -> minutes since the epoch, cached per minute
+        key = timestamp[:16]
+        minute = self._minute_cache.get(key)
+        if minute is None:
+            try:
+                minute = int(time.mktime(time.strptime(key, '%Y-%m-%d %H:%M')) // 60)
+            except (ValueError, OverflowError):
+                return None
+            if len(self._minute_cache) > 1024:
+                self._minute_cache.clear()
+            self._minute_cache[key] = minute
+        return minute
+
+    def kills_per_minute(self, now=None):
+        # {window minutes: kills per minute over the last window minutes}
+        current = int((now or time.time()) // 60)
+        oldest = current - max(self.windows)
+        for minute in [m for m in self.minutes if m <= oldest]:
+            del self.minutes[minute]
+        return {window: sum(self.minutes.get(current - i, 0) for i in range(window)) / window
+                for window in self.windows}
+
+    def leaderboard(self, count=10):
+        # Most kills first, then the better K/D
+        return heapq.nlargest(count, self.players.items(), key=lambda item: (item[1].kills, item[1].kd))
@@ -0,0 +1,156 @@
+import sqlite3
+
+from events import KillEvent
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS kills (
+    id INTEGER PRIMARY KEY,
+    log_key TEXT NOT NULL,
+    log_offset INTEGER NOT NULL,
+    event_time TEXT NOT NULL,
+    victim TEXT NOT NULL COLLATE NOCASE,
+    killer TEXT COLLATE NOCASE,
+    zone TEXT COLLATE NOCASE,
+    weapon TEXT,
+    damage_type TEXT,
+    UNIQUE (log_key, log_offset)
+);
+CREATE INDEX IF NOT EXISTS kills_victim ON kills (victim, event_time);
+CREATE INDEX IF NOT EXISTS kills_killer ON kills (killer, event_time);
+CREATE INDEX IF NOT EXISTS kills_zone ON kills (zone, event_time);
+CREATE INDEX IF NOT EXISTS kills_time ON kills (event_time);
+CREATE TABLE IF NOT EXISTS imported_logs (
+    log_key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    kills INTEGER NOT NULL,
+    imported_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+'''
+
+COLUMNS = 'log_offset, victim, killer, zone, event_time, weapon, damage_type'
+
+
+class KillFilter:
+    # Filter for the kills table. The same filter is turned into SQL for
+    # queries and checked in Python for kills that arrive live, so the table
+    # can be updated without re-running the query.
+
+    def __init__(self, player=None, zone=None, since=None, until=None, log_key=None, log_keys=None):
+        self.player = player or None
+        self.zone = zone or None  # Prefix match
+        self.since = since or None
+        # Times compare as text; the '~' suffix sorts after any time, so a bare
+        # date (or hour) as the upper bound still includes all of it
+        self.until = (until + '~') if until else None
+        self.log_key = log_key or None  # Limit to one log file
+        # Or to several; logs without a key yet have no kills, so a list
+        # with no key at all matches nothing
+        self.log_keys = frozenset(key for key in log_keys if key) if log_keys is not None else None
+
+    def where(self):
+        clauses = []
+        params = []
+        if self.player:
+            clauses.append('(victim = ? OR killer = ?)')
+            params += [self.player, self.player]
+        if self.zone:
+            clauses.append("zone LIKE ? ESCAPE '\\'")
+            escaped = self.zone.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(escaped + '%')
+        if self.since:
+            clauses.append('event_time >= ?')
+            params.append(self.since)
+        if self.until:
+            clauses.append('event_time <= ?')
+            params.append(self.until)
+        if self.log_key:
+            clauses.append('log_key = ?')
+            params.append(self.log_key)
+        if self.log_keys is not None:
+            clauses.append(f"log_key IN ({', '.join('?' * len(self.log_keys))})" if self.log_keys else '0')
+            params += sorted(self.log_keys)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def matches(self, event, log_key=None):
+        if self.player:
+            player = self.player.lower()
+            if event.victim.lower() != player and (event.killer or '').lower() != player:
+                return False
+        if self.zone and not (event.zone or '').lower().startswith(self.zone.lower()):
+            return False
+        if self.since and event.timestamp < self.since:
+            return False
+        if self.until and event.timestamp > self.until:
+            return False
+        if self.log_key and log_key != self.log_key:
+            return False
+        if self.log_keys is not None and log_key not in self.log_keys:
+            return False
+        return True
+
+
+class KillStore:
+    # Kill history across sessions in an embedded SQLite database. Kills are
+    # keyed on (log file, byte offset), so writing the same kill twice -- for
+    # example when a log is parsed again -- is harmless.
+
+    def __init__(self, path):
+        self.path = path
+        # The bulk importer writes from its own thread and connection
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def add_kills(self, log_key, kills):
+        # One transaction per batch. Returns the kills that were not stored
+        # yet, so a log read again after a restart is not counted twice.
+        if not kills:
+            return []
+        with self.conn:
+            offsets = [k.offset for k in kills]
+            stored = {row[0] for row in self.conn.execute(
+                'SELECT log_offset FROM kills WHERE log_key = ? AND log_offset BETWEEN ? AND ?',
+                (log_key, min(offsets), max(offsets)))}
+            new = [k for k in kills if k.offset not in stored]
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO kills (log_key, log_offset, event_time, victim, killer, zone, '
+                'weapon, damage_type) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(log_key, k.offset, k.timestamp, k.victim, k.killer, k.zone, k.weapon, k.damage_type)
+                 for k in new])
+        return new
+
+    def query(self, kill_filter=None, limit=500, offset=0):
+        # Newest kills first
+        where, params = (kill_filter or KillFilter()).where()
+        cursor = self.conn.execute(
+            f'SELECT {COLUMNS} FROM kills{where} ORDER BY event_time DESC, id DESC LIMIT ? OFFSET ?',
+            params + [limit, offset])
+        return [KillEvent(*row) for row in cursor]
+
+    def iter_kills(self, kill_filter=None):
+        # Oldest kills first, streamed from the cursor
+        where, params = (kill_filter or KillFilter()).where()
+        cursor = self.conn.execute(f'SELECT {COLUMNS} FROM kills{where} ORDER BY event_time, id', params)
+        for row in cursor:
+            yield KillEvent(*row)
+
+    def count(self, kill_filter=None):
+        where, params = (kill_filter or KillFilter()).where()
+        return self.conn.execute(f'SELECT COUNT(*) FROM kills{where}', params).fetchone()[0]
+
+    def delete_log(self, log_key):
+        with self.conn:
+            self.conn.execute('DELETE FROM kills WHERE log_key = ?', (log_key,))
+
+    def imported_keys(self):
+        return {row[0] for row in self.conn.execute('SELECT log_key FROM imported_logs')}
+
+    def mark_imported(self, log_key, path, kills):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO imported_logs (log_key, path, kills) VALUES (?, ?, ?)',
+                (log_key, path, kills))
@@ -0,0 +1,151 @@
+import time
+
+from events import SKILL_ISSUE
+from kill_store import KillFilter
+
+FRAME_MS = 16
+DEFAULT_ROW_HEIGHT = 20
+HEADING_HEIGHT = 25
+WHEEL_ROWS = 3
+
+
+class KillTable:
+    # Virtualized view of the kill store for the kills Treeview. Only the
+    # rows that fit on screen exist as Treeview items; scrolling re-fills
+    # those same items from a small window of rows cached from the store.
+    # Live kills are prepended to that cache without a query, and all
+    # widget updates are coalesced into one render per frame, so memory and
+    # redraw cost do not grow with the number of recorded kills.
+
+    def __init__(self, tree, scrollbar, store, on_change=None, metrics=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        self.on_change = on_change  # Called after total changes
+        self.metrics = metrics
+        self.kill_filter = KillFilter()
+        self.total = 0  # Kills matching the filter
+        self.top = 0  # Index of the first visible row, 0 is the newest kill
+        self.visible = 10
+        self._cache = []
+        self._cache_start = 0
+        self._render_id = None
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-WHEEL_ROWS))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(WHEEL_ROWS))
+
+    def set_filter(self, kill_filter):
+        self.kill_filter = kill_filter
+        self.top = 0
+        self.reload()
+
+    def reload(self):
+        # Re-count and re-fetch from the store, keeping the scroll position
+        self.total = self.store.count(self.kill_filter)
+        self.top = max(0, min(self.top, self.total - self.visible))
+        self._cache = []
+        self._cache_start = 0
+        self._changed()
+
+    def add(self, kills, log_key):
+        # kills are already stored; only the ones matching the filter count
+        matching = [kill for kill in kills if self.kill_filter.matches(kill, log_key)]
+        if not matching:
+            return
+        self.total += len(matching)
+        if self._cache_start == 0:
+            self._cache = matching[::-1] + self._cache
+            del self._cache[self._cache_limit():]
+        else:
+            self._cache_start += len(matching)
+        if self.top > 0:
+            self.top += len(matching)  # Keep showing the rows the user scrolled to
+        self._changed()
+
+    def _cache_limit(self):
+        return self.visible * 4
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+        if self._render_id is None:
+            self._render_id = self.tree.after(FRAME_MS, self.render)
+
+    def rows(self, start, count):
+        end = min(self.total, start + count)
+        if not (self._cache_start <= start and end <= self._cache_start + len(self._cache)):
+            # Fetch a window around the requested rows so small scrolls need no query
+            fetch_start = max(0, start - self.visible)
+            self._cache = self.store.query(self.kill_filter, limit=self._cache_limit(), offset=fetch_start)
+            self._cache_start = fetch_start
+        return self._cache[start - self._cache_start:end - self._cache_start]
+
+    def render(self):
+        self._render_id = None
+        started = time.perf_counter()
+        rows = self.rows(self.top, self.visible)
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+
+        for index, kill in enumerate(rows):
+            values, tags = self.row(kill, self.total - 1 - (self.top + index))
+            if index < len(items):
+                self.tree.item(items[index], values=values, tags=tags)
+            else:
+                self.tree.insert('', 'end', values=values, tags=tags)
+
+        if self.total:
+            self.scrollbar.set(self.top / self.total, min(1.0, (self.top + self.visible) / self.total))
+        else:
+            self.scrollbar.set(0, 1)
+        if self.metrics is not None:
+            self.metrics.observe('render', time.perf_counter() - started)
+
+    def row(self, kill, index):
+        # index counts from the oldest kill so a row keeps its color as new kills arrive
+        if kill.killer is None:
+            # No killer in the log line
+            killer = SKILL_ISSUE
+            tags = ('kill_even', 'skill_issue') if index % 2 == 0 else ('kill_odd', 'skill_issue')
+        else:
+            killer = kill.killer
+            tags = ('kill_even',) if index % 2 == 0 else ('kill_odd',)
+        return (kill.victim, killer, kill.timestamp, kill.zone), tags
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), self.total - self.visible))
+        if top != self.top:
+            self.top = top
+            self._changed()
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def yview(self, *args):
+        # Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages')
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def on_wheel(self, event):
+        self.scroll(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS)
+        return 'break'
+
+    def on_resize(self, event):
+        try:
+            row_height = int(self.tree.winfo_toplevel().tk.call(
+                'ttk::style', 'lookup', 'Treeview', '-rowheight') or DEFAULT_ROW_HEIGHT)
+        except Exception:
+            row_height = DEFAULT_ROW_HEIGHT
+        visible = max(1, (event.height - HEADING_HEIGHT) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._cache = []
+            self._changed()
@@ -0,0 +1,54 @@
+import re
+
+
+def term_pattern(term):
+    # '<Actor Death>' is an event tag, '[Notice]' a channel, '/.../' a regex,
+    # anything else a plain substring
+    if len(term) > 2 and term[0] == '/' and term[-1] == '/':
+        return term[1:-1]
+    return re.escape(term)
+
+
+def parse_terms(text):
+    # Comma-separated terms as typed in the filter bar
+    return [term.strip() for term in text.split(',') if term.strip()]
+
+
+# Parts of a line that change between otherwise identical repeats: the
+# leading timestamp, then hex values, GUIDs and any other run of digits
+LEADING_TIMESTAMP = re.compile(r'^<[^>]*>\s*')
+VOLATILE = re.compile(r'0x[0-9A-Fa-f]+|[0-9A-Fa-f]{8}(?:-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}|\d+')
+
+
+def repeat_key(text):
+    # Lines with the same key are repeats of each other
+    return VOLATILE.sub('#', LEADING_TIMESTAMP.sub('', text, count=1))
+
+
+def _compile(terms):
+    if not terms:
+        return None
+    # One alternation, so a line costs a single search however many terms there are
+    return re.compile('|'.join('(?:%s)' % term_pattern(term) for term in terms), re.IGNORECASE)
+
+
+class LineFilter:
+    # Decides which log lines reach the Full Log. A line is shown when it
+    # matches any include term (or there are none) and no exclude term.
+    # Raises re.error for an invalid regex term.
+
+    def __init__(self, include=(), exclude=()):
+        self.include = list(include)
+        self.exclude = list(exclude)
+        self._include = _compile(self.include)
+        self._exclude = _compile(self.exclude)
+
+    def __bool__(self):
+        return bool(self._include or self._exclude)
+
+    def matches(self, text):
+        if self._include is not None and self._include.search(text) is None:
+            return False
+        if self._exclude is not None and self._exclude.search(text) is not None:
+            return False
+        return True
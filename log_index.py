@@ -0,0 +1,170 @@
+import os
+import re
+import threading
+import time
+from array import array
+
+from tailer import HEADER_SIZE, open_shared
+
+BLOCK_SIZE = 1024 * 1024  # Bytes of log per index block
+MAX_RESULTS = 500
+SLICE_SIZE = 64 * 1024  # Bytes tokenized at a time before letting other threads run
+
+# Runs of letters; digits and punctuation split words. Entity ids and
+# numbers are what makes log lines unique, so leaving them out keeps the
+# vocabulary, and with it the index, small.
+_WORDS = re.compile(r'[^\W\d_]+')
+
+
+def _trigrams(words):
+    grams = set()
+    for word in words:
+        for i in range(len(word) - 2):
+            grams.add(word[i:i + 3])
+    return grams
+
+
+class LogIndex(threading.Thread):
+    # Search index over a log, built and kept up to date on a background
+    # thread. The log is split into blocks of about BLOCK_SIZE bytes at line
+    # boundaries; for every letter trigram the index lists the blocks that
+    # contain it. A search only reads the blocks holding all trigrams of
+    # the query (plus the part of the log not indexed yet) and checks their
+    # lines, so results come back with their byte offsets.
+    #
+    # Letter runs of the query are substrings of letter runs in any matching
+    # line, so their trigrams are always in the index: the index can rule
+    # blocks out but never misses a match. A query without three letters in
+    # a row falls back to reading every block.
+
+    def __init__(self, path, block_size=BLOCK_SIZE, encoding='utf-8'):
+        super().__init__(daemon=True)
+        self.path = path
+        self.block_size = block_size
+        self.encoding = encoding
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.wakeup = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        with self.lock:
+            self.blocks = []  # (offset, length) of every indexed block
+            self.postings = {}  # trigram -> array of block numbers
+            self.end = 0  # Everything before this offset is indexed
+            self.header = b''
+
+    def stop(self):
+        self.stopping.set()
+        self.wakeup.set()
+
+    def progress(self):
+        # Less than a block past the end is never indexed, it is searched directly
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 1.0
+        if size - self.end < self.block_size:
+            return 1.0
+        return self.end / size
+
+    def run(self):
+        while not self.stopping.is_set():
+            try:
+                added = self.index_available()
+            except OSError:
+                added = False
+            if not added:
+                self.wakeup.wait(1.0)
+                self.wakeup.clear()
+
+    def index_available(self):
+        # Indexes the complete blocks written since the last call; returns
+        # True when there may be more
+        with open_shared(self.path) as f:
+            size = os.fstat(f.fileno()).st_size
+            header = f.read(HEADER_SIZE)
+            if size < self.end or header[:len(self.header)] != self.header:
+                self._reset()  # A new log took this path's place
+            self.header = header
+
+            f.seek(self.end)
+            for _ in range(8):  # Return now and then so stop() is noticed
+                if self.stopping.is_set():
+                    return False
+                data = f.read(self.block_size)
+                if len(data) < self.block_size:
+                    return False  # The rest is searched directly until a block is complete
+                last = data.rfind(b'\n')
+                if last >= 0:
+                    data = data[:last + 1]
+                f.seek(self.end + len(data))
+                self._add_block(data)
+        return True
+
+    def _add_block(self, data):
+        # Tokenizing a whole block at once would hold the GIL long enough to
+        # stall the Tk thread, so it is done in slices at line boundaries
+        words = set()
+        start = 0
+        while start < len(data):
+            end = data.find(b'\n', start + SLICE_SIZE)
+            end = len(data) if end < 0 else end + 1
+            words.update(_WORDS.findall(data[start:end].decode(self.encoding, errors='replace').lower()))
+            start = end
+            time.sleep(0)
+        grams = _trigrams(words)
+        with self.lock:
+            number = len(self.blocks)
+            self.blocks.append((self.end, len(data)))
+            postings = self.postings
+            for gram in grams:
+                blocks = postings.get(gram)
+                if blocks is None:
+                    blocks = postings[gram] = array('I')
+                blocks.append(number)
+            self.end += len(data)
+
+    def candidates(self, query):
+        # Byte ranges (offset, length) that may hold a line containing query
+        grams = _trigrams(_WORDS.findall(query.lower()))
+        with self.lock:
+            if grams:
+                lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+                numbers = set(lists[0])
+                for blocks in lists[1:]:
+                    if not numbers:
+                        break
+                    numbers.intersection_update(blocks)
+                ranges = [self.blocks[n] for n in sorted(numbers)]
+            else:
+                ranges = list(self.blocks)
+            end = self.end
+        size = os.path.getsize(self.path)
+        if size > end:
+            ranges.append((end, size - end))
+        return ranges
+
+    def search(self, query, limit=MAX_RESULTS, cancelled=None):
+        # Case-insensitive substring search; returns (offset, text) in file order
+        needle = query.lower()
+        results = []
+        if not needle:
+            return results
+        with open_shared(self.path) as f:
+            for offset, length in self.candidates(query):
+                if cancelled is not None and cancelled.is_set():
+                    break
+                f.seek(offset)
+                data = f.read(length)
+                if offset + length > self.end:
+                    # Unindexed tail: only complete lines
+                    data = data[:data.rfind(b'\n') + 1]
+                for raw in data.split(b'\n'):
+                    text = raw.decode(self.encoding, errors='replace')
+                    if needle in text.lower():
+                        results.append((offset, text.rstrip('\r')))
+                        if len(results) >= limit:
+                            return results
+                    offset += len(raw) + 1
+        return results
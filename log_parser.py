@@ -0,0 +1,162 @@
+import calendar
+import re
+import time
+
+from events import (
+    KillEvent, VehicleDestructionEvent, SpawnEvent, QuantumEvent,
+    DisconnectEvent, LoginEvent
+)
+
+# Game.log lines look like
+#   <2024-05-26T17:39:25.477Z> [Notice] <Actor Death> CActor::Kill: 'Victim' ...
+# The event tag is the first <...> after the timestamp. It is located with two
+# str.find calls and looked up in a dict, so the bulk of the log (network and
+# asset noise) is rejected without running a single regex. Each tag has one
+# precompiled pattern that is matched anchored right after the tag.
+
+ACTOR_DEATH_TAG = '<Actor Death>'
+
+# Quoted fields are matched with [^']* runs instead of .+? so a line that does
+# not fit fails fast instead of backtracking
+ACTOR_DEATH = re.compile(
+    r"[^']*'([^']+)'"                          # victim
+    r"[^']*?zone '([^']+)'"                    # zone / vehicle
+    r"(?:[^']*?killed by '([^']+)')?"          # killer
+    r"(?:[^']*?using '([^']+)')?"              # weapon
+    r"(?:[^']*?damage type '([^']+)')?"        # damage type
+)
+
+VEHICLE_DESTRUCTION = re.compile(
+    r"[^']*?Vehicle '([^']+)'"                  # vehicle
+    r"[^']*?zone '([^']+)'"                     # zone
+    r"(?:[^']*?driven by '([^']+)')?"           # driver
+    r"[^']*?destroy level (\d+) to (\d+)"       # destroy levels
+    r"(?:[^']*?caused by '([^']+)')?"           # attacker
+    r"(?:[^']*?with '([^']+)')?"                # cause
+)
+
+SPAWN = re.compile(r"[^']*?Player '([^']+)'[^']*?\] ([a-z ]+?) (?:for )?spawnpoint ([^\s\[]+)")
+
+QUANTUM = re.compile(r"(?:[^']*?'([^']+)')?(?:[^']*?to '([^']+)')?")
+
+DISCONNECT = re.compile(r"\s*(.*)")
+
+LOGIN = re.compile(r".*? - name (\S+)")
+
+
+# Minute prefix of a log timestamp -> (local 'YYYY-MM-DD HH:MM', epoch seconds).
+# Consecutive lines share the prefix, so the calendar math runs about once a
+# minute of log and every other line only slices out its seconds.
+_minutes = {}
+MAX_CACHED_MINUTES = 4096
+
+
+def log_timestamp(line):
+    # '<2024-05-26T17:39:25.477Z> ...' -> ('2024-05-26 19:39:25', epoch), with
+    # the UTC log time shown in local time. None when the line has no timestamp.
+    if line[:1] != '<' or line[11:12] != 'T' or line[20:21] != '.':
+        return None
+    seconds = line[18:20]
+    millis = line[21:24]
+    if not (seconds.isdigit() and millis.isdigit()):
+        return None
+
+    minute = line[1:17]
+    cached = _minutes.get(minute)
+    if cached is None:
+        try:
+            epoch = calendar.timegm((int(line[1:5]), int(line[6:8]), int(line[9:11]),
+                                     int(line[12:14]), int(line[15:17]), 0))
+        except ValueError:
+            return None
+        if len(_minutes) >= MAX_CACHED_MINUTES:
+            _minutes.clear()
+        cached = _minutes[minute] = (time.strftime('%Y-%m-%d %H:%M', time.localtime(epoch)), epoch)
+    return cached[0] + ':' + seconds, cached[1] + int(seconds) + int(millis) / 1000
+
+
+def _event_time(line):
+    # The time the game wrote the line, falling back to now for lines
+    # without a timestamp
+    stamp = log_timestamp(line)
+    if stamp is None:
+        return time.strftime("%Y-%m-%d %H:%M:%S")
+    return stamp[0]
+
+
+def _actor_death(match, offset):
+    victim, zone, killer, weapon, damage_type = match.groups()
+    # A missing killer is shown as SKILL ISSUE
+    return KillEvent(offset, victim, killer, zone, _event_time(match.string), weapon, damage_type)
+
+
+def _vehicle_destruction(match, offset):
+    vehicle, zone, driver, from_level, to_level, caused_by, cause = match.groups()
+    return VehicleDestructionEvent(
+        offset, vehicle, zone, driver, int(from_level), int(to_level), caused_by, cause, _event_time(match.string))
+
+
+def _spawn(match, offset):
+    player, action, spawnpoint = match.groups()
+    return SpawnEvent(offset, player, spawnpoint, action, _event_time(match.string))
+
+
+def _quantum(state):
+    def build(match, offset):
+        vehicle, destination = match.groups()
+        return QuantumEvent(offset, vehicle, state, destination, _event_time(match.string))
+    return build
+
+
+def _disconnect(match, offset):
+    return DisconnectEvent(offset, match.group(1), _event_time(match.string))
+
+
+def _login(match, offset):
+    return LoginEvent(offset, match.group(1), _event_time(match.string))
+
+
+# Tag (without the angle brackets) -> (pattern, event builder)
+TAG_PARSERS = {
+    'Actor Death': (ACTOR_DEATH, _actor_death),
+    'Vehicle Destruction': (VEHICLE_DESTRUCTION, _vehicle_destruction),
+    'Spawn Flow': (SPAWN, _spawn),
+    'Quantum Drive Started': (QUANTUM, _quantum('started')),
+    'Quantum Drive Arrived': (QUANTUM, _quantum('arrived')),
+    'Jump Drive State Changed': (QUANTUM, _quantum('jump')),
+    'Disconnect': (DISCONNECT, _disconnect),
+    'Channel Disconnected': (DISCONNECT, _disconnect),
+    'AccountLoginCharacterStatus_Character': (LOGIN, _login),
+}
+
+EVENT_TAGS = tuple('<%s>' % tag for tag in TAG_PARSERS)
+
+
+def find_tag(line):
+    # Returns (tag, end) for the event tag of a line, or (None, -1)
+    start = 0
+    if line.startswith('<') and line[1:2].isdigit():
+        # Skip the leading <timestamp>
+        start = line.find('>') + 1
+    start = line.find('<', start)
+    if start < 0:
+        return None, -1
+    end = line.find('>', start)
+    if end < 0:
+        return None, -1
+    return line[start + 1:end], end + 1
+
+
+def parse_line(line, offset=0):
+    tag, end = find_tag(line)
+    if tag is None:
+        return None
+    entry = TAG_PARSERS.get(tag)
+    if entry is None:
+        return None
+
+    pattern, build = entry
+    match = pattern.match(line, end)
+    if not match:
+        return None
+    return build(match, offset)
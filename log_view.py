@@ -0,0 +1,371 @@
+import heapq
+import itertools
+import time
+import tkinter as tk
+from array import array
+from collections import deque
+
+from line_filter import repeat_key
+from tailer import DEFAULT_MAX_LINES, read_lines_at, read_lines_before
+
+FRAME_MS = 16  # Coalesce inserts to at most one widget update per frame
+MAX_FILTER_SCAN_LINES = 200000  # Most lines read back per load_older() while a filter hides lines
+
+
+class Repeat:
+    # One displayed row standing for count consecutive lines that differ only
+    # in timestamps and IDs. The byte offsets of all of them are kept so the
+    # row can be expanded back into the original lines (None when a line had
+    # no offset to read it back from).
+
+    __slots__ = ('source', 'text', 'count', 'offsets')
+
+    def __init__(self, source, text, offset):
+        self.source = source
+        self.text = text  # As displayed, without the counter
+        self.count = 1
+        self.offsets = array('q', [offset]) if offset is not None else None
+
+    def add(self, offset):
+        self.count += 1
+        if self.offsets is not None:
+            if offset is None:
+                self.offsets = None
+            else:
+                self.offsets.append(offset)
+
+    def display(self):
+        return f'{self.text}  [{self.count}x]'
+
+
+class LogView:
+    # Ring buffer in front of the Full Log text widget. Only the newest
+    # max_lines lines are kept in the widget; older content is still reachable
+    # with load_older(), which reads it back from the log file by byte offset.
+    #
+    # An optional line filter is applied before lines reach the widget. The
+    # newest max_lines lines are also kept unfiltered, so changing or turning
+    # off the filter redraws from memory instead of reading the file again.
+    #
+    # Lines are kept per source (LIVE, PTU, ...). The view shows one source,
+    # or all of them merged in arrival order with the source name in front;
+    # switching redraws from memory the same way. Paging back and offsets
+    # only apply to a single source.
+    #
+    # Runs of repeated lines (the same once timestamps and IDs are ignored)
+    # are collapsed into one row whose counter is updated in place;
+    # double-clicking the row expands it into the original lines.
+
+    def __init__(self, text_widget, max_lines=DEFAULT_MAX_LINES, metrics=None):
+        self.text = text_widget
+        self.max_lines = max_lines
+        self.metrics = metrics
+        self.paths = {}  # Source name -> log path
+        self.source = None  # Source shown, None for all of them merged
+        self.offsets = deque()  # Byte offset of every displayed line (None for messages)
+        self.history_lines = 0  # Lines paged back in with load_older()
+        self.line_filter = None
+        self.collapse = True
+        self.repeats = deque()  # Repeat of every displayed row, None for single lines
+        # Per source, (seq, source, offset, text, is_line) of the newest lines
+        # before filtering; messages for every source are kept under None
+        self.recent = {}
+        self._seq = itertools.count()
+        self._older_from = None  # Where the last load_older() stopped reading
+        self._pending = deque()  # (offset, text, repeat) rows waiting for the next flush
+        self._flush_id = None
+        self._reset_run()
+        self.text.bind('<Double-Button-1>', self.on_double_click)
+
+    def _reset_run(self):
+        # The next line starts a new row whatever it repeats
+        self._last_key = None
+        self._last_offset = None
+        self._last_text = None
+        self._last_repeat = None
+        self._repeat_changed = False  # The counter of the last displayed row needs redrawing
+
+    @property
+    def log_path(self):
+        # Log that displayed offsets point into
+        return self.paths.get(self.page_source())
+
+    def page_source(self):
+        # The source whose byte offsets the displayed lines carry
+        if self.source is None and len(self.paths) == 1:
+            return next(iter(self.paths))
+        return self.source
+
+    def _shows(self, source):
+        return self.source is None or source is None or source == self.source
+
+    def _entry(self, source, offset, text):
+        # (offset, text) as displayed in the current view
+        if source != self.page_source():
+            offset = None
+        if self.source is None and source is not None and len(self.paths) > 1:
+            text = f'[{source}] {text}'
+        return offset, text
+
+    def append(self, lines, source=None):
+        # lines is an iterable of LogLine events from one source
+        ring = self.recent.setdefault(source, deque())
+        shown = self._shows(source)
+        line_filter = self.line_filter
+        for line in lines:
+            ring.append((next(self._seq), source, line.offset, line.text, True))
+            if shown and (line_filter is None or line_filter.matches(line.text)):
+                self._push(source, line.offset, line.text)
+        self._trim_recent(ring)
+        self._schedule_flush()
+
+    def _push(self, source, offset, text):
+        # Queues one line for display, or counts it on the row above when it
+        # repeats that row's line
+        if self.collapse:
+            key = (source, repeat_key(text))
+            if key == self._last_key:
+                repeat = self._last_repeat
+                if repeat is None:
+                    repeat = self._last_repeat = Repeat(source, self._last_text, self._last_offset)
+                    if self._pending:
+                        self._pending[-1] = self._pending[-1][:2] + (repeat,)
+                    elif self.repeats:
+                        self.repeats[-1] = repeat
+                if not self._pending:
+                    self._repeat_changed = True
+                repeat.add(offset)
+                return
+            entry = self._entry(source, offset, text)
+            self._last_key = key
+            self._last_offset = offset
+            self._last_text = entry[1]
+            self._last_repeat = None
+        else:
+            entry = self._entry(source, offset, text)
+        self._pending.append(entry + (None,))
+
+    def write_message(self, message, source=None):
+        # Messages are never filtered; without a source they show in every view
+        ring = self.recent.setdefault(source, deque())
+        shown = self._shows(source)
+        for text in message.rstrip('\n').split('\n'):
+            ring.append((next(self._seq), source, None, text, False))
+            if shown:
+                self._pending.append(self._entry(source, None, text) + (None,))
+                self._reset_run()
+        self._trim_recent(ring)
+        self._schedule_flush()
+
+    def _trim_recent(self, ring):
+        while len(ring) > self.max_lines:
+            ring.popleft()
+
+    def set_filter(self, line_filter):
+        self.line_filter = line_filter or None
+        self.redraw()
+
+    def show_source(self, source):
+        # None merges all sources
+        self.source = source
+        self.redraw()
+
+    def set_collapse(self, collapse):
+        self.collapse = collapse
+        self.redraw()
+
+    def redraw(self):
+        # Redraws the view from the unfiltered lines kept in memory
+        if self._flush_id is not None:
+            self.text.after_cancel(self._flush_id)
+            self._flush_id = None
+        self.offsets.clear()
+        self.repeats.clear()
+        self.history_lines = 0
+        self._older_from = None
+        self.text.delete('1.0', tk.END)
+        self._pending = deque()
+        self._reset_run()
+        line_filter = self.line_filter
+        rings = [ring for source, ring in self.recent.items() if self._shows(source)]
+        # Each ring is in arrival order, so merging on seq interleaves them as they came
+        for _, source, offset, text, is_line in heapq.merge(*rings):
+            if not is_line:
+                self._pending.append(self._entry(source, None, text) + (None,))
+                self._reset_run()
+            elif line_filter is None or line_filter.matches(text):
+                self._push(source, offset, text)
+        self.flush()
+
+    def pending(self):
+        # Lines waiting for the next flush
+        return len(self._pending)
+
+    def clear(self):
+        if self._flush_id is not None:
+            self.text.after_cancel(self._flush_id)
+            self._flush_id = None
+        self._pending.clear()
+        self.offsets.clear()
+        self.repeats.clear()
+        self.recent = {}
+        self.history_lines = 0
+        self._older_from = None
+        self._reset_run()
+        self.text.delete('1.0', tk.END)
+
+    def start_new_file(self, source=None):
+        # Lines shown so far from source came from a log that has since been
+        # replaced. They stay visible but can no longer be used to page back.
+        if source in self.recent:
+            self.recent[source] = deque((seq, name, None, text, is_line)
+                                        for seq, name, _, text, is_line in self.recent[source])
+        if source == self.page_source():
+            self.offsets = deque(None for _ in self.offsets)
+            self._pending = deque((None, text, repeat) for _, text, repeat in self._pending)
+            self.history_lines = 0
+            self._older_from = None
+        # Collapsed rows of that source can no longer be expanded from the file
+        for repeat in itertools.chain(self.repeats, (repeat for _, _, repeat in self._pending)):
+            if repeat is not None and repeat.source == source:
+                repeat.offsets = None
+        if self._last_key is not None and self._last_key[0] == source:
+            self._reset_run()
+
+    def _schedule_flush(self):
+        if self._flush_id is None:
+            self._flush_id = self.text.after(FRAME_MS, self.flush)
+
+    def flush(self):
+        self._flush_id = None
+        if not self._pending and not self._repeat_changed:
+            return
+        started = time.perf_counter()
+        at_bottom = self.text.yview()[1] >= 0.999
+
+        if self._repeat_changed:
+            # Only the counter of the last row changed: rewrite that line in place
+            self._repeat_changed = False
+            if self.repeats and self.repeats[-1] is not None:
+                line = len(self.offsets)
+                self.text.delete(f'{line}.0', f'{line}.end')
+                self.text.insert(f'{line}.0', self.repeats[-1].display())
+
+        limit = self.max_lines + self.history_lines
+        pending = self._pending
+        # Lines that would be trimmed right away are never inserted
+        while len(pending) > limit:
+            pending.popleft()
+
+        if pending:
+            self.text.insert(tk.END, '\n'.join(text if repeat is None else repeat.display()
+                                               for _, text, repeat in pending) + '\n')
+            self.offsets.extend(offset for offset, _, _ in pending)
+            self.repeats.extend(repeat for _, _, repeat in pending)
+            pending.clear()
+        self.trim()
+        if at_bottom:
+            self.text.see(tk.END)
+        if self.metrics is not None:
+            self.metrics.observe('render', time.perf_counter() - started)
+
+    def trim(self):
+        excess = len(self.offsets) - (self.max_lines + self.history_lines)
+        if excess <= 0:
+            return
+        self.text.delete('1.0', f'{excess + 1}.0')
+        for _ in range(excess):
+            self.offsets.popleft()
+            self.repeats.popleft()
+        self.history_lines = max(0, self.history_lines - excess)
+
+    def first_offset(self):
+        for offset in self.offsets:
+            if offset is not None:
+                return offset
+        return None
+
+    def show_offset(self, offset):
+        # Scrolls to and highlights the displayed line read from offset;
+        # returns False when that line is not in the widget
+        for index, (line_offset, repeat) in enumerate(zip(self.offsets, self.repeats)):
+            if line_offset == offset or (repeat is not None and repeat.offsets is not None
+                                         and repeat.source == self.page_source() and offset in repeat.offsets):
+                line = f'{index + 1}.0'
+                self.text.tag_remove('found', '1.0', tk.END)
+                self.text.tag_add('found', line, f'{line} lineend')
+                self.text.tag_configure('found', background='#665500')
+                self.text.see(line)
+                return True
+        return False
+
+    def _oldest_offset(self):
+        # Where paging back continues: before the oldest line displayed, kept
+        # in memory, or already read back and filtered out
+        offsets = [self._older_from, self.first_offset()]
+        ring = self.recent.get(self.page_source(), ())
+        offsets += [next((offset for _, _, offset, _, _ in ring if offset is not None), None)]
+        offsets = [offset for offset in offsets if offset is not None]
+        return min(offsets) if offsets else None
+
+    def load_older(self, count=None):
+        # Page back: insert the count lines (that pass the filter) preceding
+        # the oldest displayed line
+        end = self._oldest_offset()
+        if not self.log_path or not end:
+            return 0
+        count = count or self.max_lines
+        line_filter = self.line_filter
+        lines = []
+        scanned = 0
+        while end and len(lines) < count and scanned < MAX_FILTER_SCAN_LINES:
+            block, _ = read_lines_before(self.log_path, end, count)
+            if not block:
+                break
+            scanned += len(block)
+            end = block[0][0]
+            if line_filter is not None:
+                block = [line for line in block if line_filter.matches(line[1])]
+            lines[:0] = block
+        if len(lines) > count:
+            lines = lines[-count:]
+            end = lines[0][0]
+        self._older_from = end
+        if not lines:
+            return 0
+
+        self.text.insert('1.0', '\n'.join(text for _, text in lines) + '\n')
+        self.offsets.extendleft(offset for offset, _ in reversed(lines))
+        self.repeats.extendleft(None for _ in lines)
+        self.history_lines += len(lines)
+        self.text.see('1.0')
+        return len(lines)
+
+    def on_double_click(self, event):
+        row = int(self.text.index(f'@{event.x},{event.y}').split('.')[0]) - 1
+        if self.expand(row):
+            return 'break'
+
+    def expand(self, row):
+        # Replaces a collapsed row with the lines it stands for, read back
+        # from the log by offset; returns False when there is nothing to expand
+        repeat = self.repeats[row] if 0 <= row < len(self.repeats) else None
+        path = self.paths.get(repeat.source) if repeat is not None else None
+        if repeat is None or repeat.offsets is None or not path:
+            return False
+        if repeat is self._last_repeat:
+            self._reset_run()  # Further repeats start a new row
+
+        entries = [self._entry(repeat.source, offset, text) for offset, text in read_lines_at(path, repeat.offsets)]
+        line = f'{row + 1}.0'
+        self.text.delete(line, f'{row + 2}.0')
+        self.text.insert(line, '\n'.join(text for _, text in entries) + '\n')
+        offsets = list(self.offsets)
+        offsets[row:row + 1] = [offset for offset, _ in entries]
+        self.offsets = deque(offsets)
+        repeats = list(self.repeats)
+        repeats[row:row + 1] = [None] * len(entries)
+        self.repeats = deque(repeats)
+        # Kept like paged-in history rather than trimmed on the next flush
+        self.history_lines += len(entries) - 1
+        return True
@@ -1,665 +1,263 @@
-import tkinter as tk
-from tkinter import scrolledtext, ttk, messagebox, filedialog
-import os
-import time
-import re
+import argparse
 import json
-import webbrowser
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
-
-class LogMonitor(FileSystemEventHandler):
-    def __init__(self, text_widget, kills_tree, log_path):
-        self.text_widget = text_widget
-        self.kills_tree = kills_tree
-        self.last_position = 0
-        self.log_path = log_path
-        self.last_check = 0
-        self.check_interval = 0.1  # Check every 100ms
-        self.kill_count = 0
-
-    def parse_kill(self, line):
-        # First try to match with killer information
-        pattern = r'<Actor Death>.+?\'([^\']+)\'.+?zone \'([^\']+)\'.+?killed by \'([^\']+)\''
-        match = re.search(pattern, line)
-        
-        if not match:
-            # Try to match without killer information
-            pattern = r'<Actor Death>.+?\'([^\']+)\'.+?zone \'([^\']+)\''
-            match = re.search(pattern, line)
-            if match:
-                victim = match.group(1)
-                zone = match.group(2)
-                killer = "SKILL ISSUE"  # When no killer is found
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Insert with alternating row colors and special tag for skill issue
-                tags = ('kill_even', 'skill_issue') if self.kill_count % 2 == 0 else ('kill_odd', 'skill_issue')
-                self.kills_tree.insert('', 0, values=(victim, killer, timestamp, zone), tags=tags)
-                self.kill_count += 1
-                return
-
-        if match:
-            victim = match.group(1)
-            zone = match.group(2)
-            killer = match.group(3)
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Insert with alternating row colors
-            tags = ('kill_even',) if self.kill_count % 2 == 0 else ('kill_odd',)
-            self.kills_tree.insert('', 0, values=(victim, killer, timestamp, zone), tags=tags)
-            self.kill_count += 1
-            
-            # Update HUD if it exists
-            if hasattr(self.text_widget.master, 'sync_hud_kills'):
-                self.text_widget.master.sync_hud_kills()
-
-    def check_file(self):
-        try:
-            current_time = time.time()
-            if current_time - self.last_check < self.check_interval:
-                return
-            self.last_check = current_time
-
-            if os.path.exists(self.log_path):
-                with open(self.log_path, 'r', encoding='utf-8') as file:
-                    file.seek(self.last_position)
-                    new_text = file.read()
-                    if new_text:
-                        self.last_position = file.tell()
-                        self.text_widget.insert(tk.END, new_text)
-                        self.text_widget.see(tk.END)
-                        
-                        # Process each line for kills
-                        for line in new_text.splitlines():
-                            if '<Actor Death>' in line:
-                                self.parse_kill(line)
-        except Exception as e:
-            print(f"Error reading log: {str(e)}")
-
-    def on_modified(self, event):
-        if event.src_path == self.log_path:
-            self.check_file()
-
-class Application(tk.Tk):
-    def __init__(self):
-        super().__init__()
-
-        self.title("Star Citizen Log Scanner")
-        self.geometry("1000x600")
-        self.minsize(800, 400)
-        
-        # Initialize variables before creating layout
-        self.config_file = os.path.join(os.path.expanduser('~'), 'sc_scanner_config.json')
-        self.log_path = None
-        self.monitor = None
-        self.observer = None
-        
-        # Modern theme configurations
-        self.dark_theme = {
-            'bg': '#1a1b1e',
-            'fg': '#ffffff',
-            'select_bg': '#663399',
-            'select_fg': '#ffffff',
-            'tree_bg': '#2a2b2e',
-            'tree_fg': '#ffffff',
-            'button_bg': '#663399',
-            'button_fg': '#ffffff',
-            'text_bg': '#1a1b1e',
-            'text_fg': '#e2e8f0',
-            'frame_bg': '#2a2b2e',
-            'hover_bg': '#7a3db8',
-            'border': '#3b3b3b',
-            'alternate_row': '#222326'
-        }
-        
-        self.light_theme = {
-            'bg': '#ffffff',
-            'fg': '#1a1b1e',
-            'select_bg': '#3b82f6',
-            'select_fg': '#ffffff',
-            'tree_bg': '#f8fafc',
-            'tree_fg': '#1a1b1e',
-            'button_bg': '#3b82f6',
-            'button_fg': '#ffffff',
-            'text_bg': '#ffffff',
-            'text_fg': '#1a1b1e',
-            'frame_bg': '#f1f5f9',
-            'hover_bg': '#7a3db8',
-            'border': '#e2e8f0',
-            'alternate_row': '#f8fafc'
-        }
-        
-        self.current_theme = self.dark_theme
-        self.setup_styles()
-        self.create_layout()
-        
-        # Set up file monitoring
-        self.config_file = os.path.join(os.path.expanduser('~'), 'sc_scanner_config.json')
-        self.log_path = self.load_config()
-        self.monitor = None
-        self.observer = None
-        
-        # Add file selection button to controls
-        self.select_file_button = self.create_custom_button(
-            self.controls_frame,
-            "Select Log File",
-            self.select_log_file
-        )
-        self.select_file_button.pack(side='right', padx=5)
-        
-        self.setup_file_monitoring()
-
-    def create_custom_button(self, parent, text, command):
-        btn = tk.Button(
-            parent,
-            text=text,
-            command=command,
-            bg=self.current_theme['button_bg'],
-            fg=self.current_theme['button_fg'],
-            relief='flat',
-            padx=15,
-            pady=5,
-            font=('Segoe UI', 9),
-            cursor='hand2'
-        )
-        btn.bind('<Enter>', lambda e: btn.configure(background=self.current_theme['hover_bg']))
-        btn.bind('<Leave>', lambda e: btn.configure(background=self.current_theme['button_bg']))
-        return btn
-
-    def setup_styles(self):
-        self.configure(bg=self.current_theme['bg'])
-        style = ttk.Style()
-        style.theme_use('default')
-
-        # Configure Treeview
-        style.configure('Treeview',
-            background=self.current_theme['tree_bg'],
-            foreground=self.current_theme['tree_fg'],
-            fieldbackground=self.current_theme['tree_bg'],
-            borderwidth=0)
-        
-        style.configure('Treeview.Heading',
-            background=self.current_theme['frame_bg'],
-            foreground=self.current_theme['fg'],
-            relief='flat',
-            font=('Segoe UI', 9, 'bold'))
-        
-        style.map('Treeview.Heading',
-            background=[('active', self.current_theme['frame_bg'])])
-            
-        style.configure('TLabelframe',
-            background=self.current_theme['frame_bg'],
-            bordercolor=self.current_theme['border'])
-        
-        style.configure('TLabelframe.Label',
-            background=self.current_theme['frame_bg'],
-            foreground=self.current_theme['fg'],
-            font=('Segoe UI', 9, 'bold'))
-            
-        # Configure alternating row colors
-        style.map('Treeview',
-            background=[('selected', self.current_theme['select_bg'])],
-            foreground=[('selected', self.current_theme['select_fg'])])
-
-    def create_tooltip(self, widget, text):
-        if self.tooltip:
-            self.tooltip.destroy()
-        
-        # Get mouse position relative to screen
-        x = self.winfo_pointerx() + 15
-        y = self.winfo_pointery() + 10
-        
-        self.tooltip = tk.Toplevel(self)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-        
-        label = tk.Label(
-            self.tooltip,
-            text=text,
-            justify='left',
-            background=self.current_theme['frame_bg'],
-            foreground=self.current_theme['fg'],
-            relief='solid',
-            borderwidth=1,
-            padx=5,
-            pady=2
-        )
-        label.pack()
-
-    def hide_tooltip(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
-
-    def on_tree_motion(self, event):
-        item = self.kills_tree.identify_row(event.y)
-        if not item:
-            self.hide_tooltip()
-            return
-            
-        column = self.kills_tree.identify_column(event.x)
-        if column in ('#1', '#2'):  # Victim or Killer columns
-            self.create_tooltip(event.widget, "Click to open RSI profile")
-        else:
-            self.hide_tooltip()
-
-    def on_tree_motion(self, event):
-        item = self.kills_tree.identify_row(event.y)
-        column = self.kills_tree.identify_column(event.x)
-        
-        if item and column in ('#1', '#2'):  # Victim or Killer columns
-            self.kills_tree.configure(cursor='hand2')
-            self.create_tooltip(event.widget, "Click to open RSI profile")
-        else:
-            self.kills_tree.configure(cursor='')
-            self.hide_tooltip()
-
-    def on_tree_click(self, event):
-        item = self.kills_tree.identify_row(event.y)
-        if not item:
-            return
-            
-        column = self.kills_tree.identify_column(event.x)
-        if column not in ('#1', '#2'):  # Not Victim or Killer columns
-            return
-            
-        # Get the player name from the clicked cell
-        col_id = int(column[1]) - 1
-        player_name = self.kills_tree.item(item)['values'][col_id]
-        
-        # Open RSI profile in default browser
-        url = f"https://robertsspaceindustries.com/citizens/{player_name}"
-        webbrowser.open(url)
-
-    def toggle_theme(self):
-        self.current_theme = self.light_theme if self.current_theme == self.dark_theme else self.dark_theme
-        self.setup_styles()
-        
-        # Update text widget colors
-        self.log_text.configure(
-            bg=self.current_theme['text_bg'],
-            fg=self.current_theme['text_fg'],
-            insertbackground=self.current_theme['text_fg'],
-            selectbackground=self.current_theme['select_bg'],
-            selectforeground=self.current_theme['select_fg']
-        )
-        
-        # Update control buttons
-        for btn in [self.theme_button, self.clear_button, self.toggle_log_button]:
-            btn.configure(bg=self.current_theme['button_bg'], fg=self.current_theme['button_fg'])
-            
-        # Update tooltip if it exists
-        if self.tooltip:
-            for child in self.tooltip.winfo_children():
-                if isinstance(child, tk.Label):
-                    child.configure(
-                        background=self.current_theme['frame_bg'],
-                        foreground=self.current_theme['fg']
-                    )
-            
-        # Update tree colors
-        self.kills_tree.tag_configure('kill_even', background=self.current_theme['alternate_row'])
-        self.kills_tree.tag_configure('kill_odd', background=self.current_theme['tree_bg'])
-
-    def toggle_log_visibility(self):
-        if self.log_frame.winfo_viewable():
-            current_height = self.winfo_height()
-            log_height = self.log_frame.winfo_height()
-            self.log_frame.pack_forget()
-            self.toggle_log_button.configure(text="Show Log")
-            # Adjust window size when hiding log
-            self.geometry(f"{self.winfo_width()}x{current_height - log_height}")
+import multiprocessing
+import os
+import queue
+import sys
+
+from events import event_dict
+
+# Entry point. Without a command the GUI starts; the scan and follow
+# commands run headless and never import tkinter, so they also work on
+# machines without a display:
+#   python main.py scan Game.log --kinds kill --output kills.jsonl
+#   python main.py follow Game.log --flush event
+#   python main.py archive logbackups/*.log
+#   python main.py extract session.scarc --since "2024-05-26 19:00" --until "2024-05-26 19:30"
+
+FLUSH_MODES = ('event', 'batch', 'exit')
+DEFAULT_BATCH_SIZE = 500
+SCAN_READ_BYTES = 1024 * 1024  # Log read per step when raw lines are written too
+
+
+class JsonlWriter:
+    # Writes events as JSON lines. Matching events are written batch_size
+    # lines per write() call; flush decides how often the stream is flushed:
+    # after every event, after every batch, or only on exit.
+
+    def __init__(self, out, kinds=None, batch_size=DEFAULT_BATCH_SIZE, flush='batch'):
+        self.out = out
+        self.kinds = kinds  # None for every kind
+        self.batch_size = 1 if flush == 'event' else max(1, batch_size)
+        self.flush_mode = flush
+        self.written = 0
+
+    def write(self, events):
+        kinds = self.kinds
+        lines = [json.dumps(event_dict(event)) for event in events if kinds is None or event.kind in kinds]
+        for start in range(0, len(lines), self.batch_size):
+            self.out.write('\n'.join(lines[start:start + self.batch_size]) + '\n')
+            if self.flush_mode != 'exit':
+                self.out.flush()
+        self.written += len(lines)
+
+    def close(self):
+        self.out.flush()
+        if self.out is not sys.stdout:
+            self.out.close()
+
+
+def event_kinds(args):
+    if args.kinds:
+        kinds = {kind.strip() for kind in args.kinds.split(',') if kind.strip()}
+    else:
+        kinds = {'kill', 'vehicle_destruction', 'spawn', 'quantum', 'disconnect', 'login', 'session'}
+    if args.lines:
+        kinds.add('line')
+    return kinds
+
+
+def open_writer(args):
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    return JsonlWriter(out, event_kinds(args), args.batch_size, args.flush)
+
+
+def scan(args):
+    # Everything in the log up to now
+    writer = open_writer(args)
+    try:
+        if 'line' in writer.kinds:
+            from tailer import LogTailer
+            tailer = LogTailer(args.log)
+            try:
+                # A step can end without a complete line, so only a step that
+                # reads nothing at all means the end of the log
+                while True:
+                    read_offset = tailer.read_offset
+                    writer.write(list(tailer.events(SCAN_READ_BYTES)))
+                    if tailer.read_offset == read_offset:
+                        break
+                writer.write(list(tailer.finish()))
+            finally:
+                tailer.close()
         else:
-            self.log_frame.pack(expand=True, fill='both', padx=10, pady=(0, 10))
-            self.toggle_log_button.configure(text="Hide Log")
-
-    def clear_kills_log(self):
-        if messagebox.askyesno("Confirm Clear", 
-            "Are you sure you want to clear the kills log?\nThis action cannot be undone.",
-            icon='warning'):
-            for item in self.kills_tree.get_children():
-                self.kills_tree.delete(item)
-            self.monitor.kill_count = 0
-
-    def create_layout(self):
-        # Create controls frame at the top
-        self.controls_frame = tk.Frame(self, bg=self.current_theme['bg'])
-        self.controls_frame.pack(fill='x', padx=10, pady=(5, 0))
-        
-        # Add control buttons with modern style
-        self.theme_button = self.create_custom_button(
-            self.controls_frame,
-            "Toggle Theme",
-            self.toggle_theme
-        )
-        self.theme_button.pack(side='left', padx=(0, 5))
-
-        self.pause_button = self.create_custom_button(
-            self.controls_frame,
-            "Pause Log",
-            self.toggle_pause
-        )
-        self.pause_button.pack(side='left', padx=5)
-        self.log_paused = False
-        
-        self.hud_button = self.create_custom_button(
-            self.controls_frame,
-            "Pop HUD",
-            self.toggle_hud
-        )
-        self.hud_button.pack(side='left', padx=5)
-        self.hud_window = None
-        
-        self.clear_button = self.create_custom_button(
-            self.controls_frame,
-            "Clear Kills Log",
-            self.clear_kills_log
-        )
-        self.clear_button.pack(side='left', padx=5)
-        
-        self.toggle_log_button = self.create_custom_button(
-            self.controls_frame,
-            "Hide Log",
-            self.toggle_log_visibility
-        )
-        self.toggle_log_button.pack(side='left', padx=5)
-        
-        # Add file selection button
-        self.select_file_button = self.create_custom_button(
-            self.controls_frame,
-            "Select Log File",
-            self.select_log_file
-        )
-        self.select_file_button.pack(side='right', padx=5)
-
-        # Create kills frame
-        self.kills_frame = ttk.LabelFrame(self, text="Kills Log")
-        self.kills_frame.pack(fill='both', padx=10, pady=(0, 10), ipady=5)
-
-        # Create kills treeview with modern styling
-        self.kills_tree = ttk.Treeview(
-            self.kills_frame, 
-            columns=('Victim', 'Killer', 'Time', 'Zone'), 
-            show='headings',
-            style='Treeview',
-            height=4  # Show only 4 rows by default
-        )
-        
-        # Configure modern headings
-        headings = {
-            'Victim': 'Victim',
-            'Killer': 'Killed By',
-            'Time': 'Time',
-            'Zone': 'Zone / Vehicle'
-        }
-        
-        for col in headings:
-            self.kills_tree.heading(col, 
-                text=headings[col],
-                anchor='w' if col not in ('Time',) else 'center')
-        
-        # Configure columns with modern proportions
-        self.kills_tree.column('Victim', width=300, minwidth=200)
-        self.kills_tree.column('Killer', width=300, minwidth=200)
-        self.kills_tree.column('Time', width=100, minwidth=100, anchor='center')
-        self.kills_tree.column('Zone', width=250, minwidth=150)
-        
-        # Configure clickable names and special tags
-        self.kills_tree.tag_configure('clickable', foreground=self.current_theme['select_bg'])
-        self.kills_tree.tag_configure('skill_issue', foreground='#FF5555')  # Bright red for skill issue
-        self.kills_tree.bind('<Button-1>', self.on_tree_click)
-        
-        # Add tooltip
-        self.tooltip = None
-        self.kills_tree.bind('<Motion>', self.on_tree_motion)
-        self.kills_tree.bind('<Leave>', self.hide_tooltip)
-        
-        # Configure row tags for alternating colors
-        self.kills_tree.tag_configure('kill_even', background=self.current_theme['alternate_row'])
-        self.kills_tree.tag_configure('kill_odd', background=self.current_theme['tree_bg'])
-        
-        self.kills_tree.pack(expand=True, fill='both', padx=5, pady=5)
-
-        # Create log frame
-        self.log_frame = ttk.LabelFrame(self, text="Full Log")
-        self.log_frame.pack(expand=True, fill='both', padx=10, pady=(0, 10))
-
-        # Create main text area with modern theme
-        self.log_text = scrolledtext.ScrolledText(
-            self.log_frame,
-            wrap=tk.WORD,
-            bg=self.current_theme['text_bg'],
-            fg=self.current_theme['text_fg'],
-            insertbackground=self.current_theme['text_fg'],
-            selectbackground=self.current_theme['select_bg'],
-            selectforeground=self.current_theme['select_fg'],
-            font=('Consolas', 10),
-            relief='flat',
-            borderwidth=0,
-            padx=10,
-            pady=10
-        )
-        self.log_text.pack(expand=True, fill='both', padx=5, pady=5)
-
-    def load_config(self):
-        default_path = r"C:\Program Files\Roberts Space Industries\StarCitizen\LIVE\Game.log"
+            # Only lines with an event tag are decoded
+            from scanner import scan_windows
+            for events, _ in scan_windows(args.log):
+                writer.write(events)
+    finally:
+        writer.close()
+    print(f"Wrote {writer.written} events", file=sys.stderr)
+    return 0
+
+
+def follow(args):
+    # Like tail -f: new events as the game writes them, across log rotations
+    from watchdog.observers import Observer
+    from monitor import LogMonitor
+    from tailer import read_lines_before
+
+    server = None
+    if args.tcp_port is not None or args.sse_port is not None:
+        from event_server import EventServer
+        server = EventServer(tcp_port=args.tcp_port, sse_port=args.sse_port, allow_origin=args.allow_origin)
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config.get('log_path', default_path)
-        except Exception:
-            pass
-        return default_path
-
-    def save_config(self):
-        try:
-            config = {'log_path': self.log_path}
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f)
-        except Exception as e:
-            print(f"Error saving config: {str(e)}")
-
-    def select_log_file(self):
-        file_path = filedialog.askopenfilename(
-            title="Select Star Citizen Game.log file",
-            filetypes=[("Log files", "*.log"), ("All files", "*.*")],
-            initialdir=os.path.dirname(self.log_path)
-        )
-        if file_path:
-            self.log_path = file_path
-            self.save_config()
-            self.restart_monitoring()
-
-    def stop_monitoring(self):
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-            self.observer = None
-        self.monitor = None
-
-    def restart_monitoring(self):
-        self.stop_monitoring()
-        # Clear existing content
-        self.log_text.delete('1.0', tk.END)
-        for item in self.kills_tree.get_children():
-            self.kills_tree.delete(item)
-        self.setup_file_monitoring()
-
-    def setup_file_monitoring(self):
-        if not self.log_path or not os.path.exists(self.log_path):
-            self.log_text.insert(tk.END, "Please select the Star Citizen Game.log file using the 'Select Log File' button.\n")
-            return
+            server.start()
+        except OSError as e:
+            print(f"Cannot start the event server, is the port already in use? ({str(e)})", file=sys.stderr)
+            return 1
+
+    monitor = LogMonitor(args.log)
+    if not args.from_start:
+        # Start after the last complete line
+        _, stop = read_lines_before(args.log, os.path.getsize(args.log), 0)
+        monitor.tailer.seek(stop)
+
+    writer = open_writer(args)
+    observer = Observer()
+    try:
+        observer.schedule(monitor, os.path.dirname(os.path.abspath(args.log)), recursive=False)
+        observer.start()
+    except Exception as e:
+        print(f"File notifications unavailable, polling instead: {str(e)}", file=sys.stderr)
+    monitor.start()
+    try:
+        while True:
+            try:
+                events, _ = monitor.events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            writer.write(events)
+            if server:
+                server.publish([e for e in events if e.kind != 'line'])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if observer.is_alive():
+            observer.stop()
+            observer.join()
+        monitor.stop()
+        if server:
+            server.stop()
+        writer.close()
+    return 0
+
+
+def archive_logs(args):
+    # Compressed copies of finished sessions, one archive per log
+    from archive import archive_name, write_archive
+    os.makedirs(args.output_dir, exist_ok=True)
+    for path in args.logs:
+        if not os.path.isfile(path):
+            print(f"Log file not found: {path}", file=sys.stderr)
+            return 1
+        summary = write_archive(path, os.path.join(args.output_dir, archive_name(path)), args.codec)
+        print(f"{path} -> {summary['path']}: {summary['size'] / 1e6:.1f} MB -> "
+              f"{summary['archived_size'] / 1e6:.1f} MB, {summary['events']} events", file=sys.stderr)
+    return 0
+
+
+def extract(args):
+    # Lines or events of an archive; only the blocks of the time range are decompressed
+    from archive import SessionArchive, parse_time
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until, end=True) if args.until else None
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    try:
+        archive = SessionArchive(args.archive)
+    except (OSError, ValueError) as e:
+        print(f"Cannot open archive: {e}", file=sys.stderr)
+        return 1
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    try:
+        with archive:
+            if args.events:
+                kinds = event_kinds(args) - {'line'}
+                for event in archive.events(kinds, since, until):
+                    out.write(json.dumps(event) + '\n')
+            else:
+                for _, text in archive.lines(since, until):
+                    out.write(text + '\n')
+    except ValueError as e:
+        # A damaged block; what was before it has been written
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        out.flush()
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Star Citizen Log Scanner. Starts the GUI when no command is given.")
+    commands = parser.add_subparsers(dest='command')
+    for name, help_text in (('scan', "Write the events of a log as JSON lines and exit"),
+                            ('follow', "Write new events of a log as JSON lines as they are logged")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('log', help="Path to Game.log")
+        command.add_argument('--output', '-o', help="Append to this file instead of writing to stdout")
+        command.add_argument('--kinds', help="Comma-separated event kinds, e.g. kill,vehicle_destruction")
+        command.add_argument('--lines', action='store_true', help="Also write every raw log line")
+        command.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                             help="Events per write (default %(default)s)")
+        command.add_argument('--flush', choices=FLUSH_MODES, default='batch',
+                             help="Flush after every event, every batch, or only on exit (default %(default)s)")
+        if name == 'follow':
+            command.add_argument('--from-start', action='store_true',
+                                 help="Write the events already in the log first")
+            command.add_argument('--tcp-port', type=int,
+                                 help="Also broadcast events as JSON lines to TCP clients on localhost")
+            command.add_argument('--sse-port', type=int,
+                                 help="Also serve events as Server-Sent Events on localhost")
+            command.add_argument('--allow-origin',
+                                 help="Web origin allowed to read the SSE stream, e.g. http://localhost:8000")
+
+    from archive import CODECS, DEFAULT_ARCHIVE_DIR, DEFAULT_CODEC
+    command = commands.add_parser('archive', help="Store logs as compressed archives with their events")
+    command.add_argument('logs', nargs='+', help="Logs to archive, e.g. logbackups/*.log")
+    command.add_argument('--output-dir', '-d', default=DEFAULT_ARCHIVE_DIR,
+                         help="Folder for the archives (default %(default)s)")
+    command.add_argument('--codec', choices=sorted(CODECS), default=DEFAULT_CODEC,
+                         help="Block compression (default %(default)s)")
+
+    command = commands.add_parser('extract', help="Print the lines or events of an archive")
+    command.add_argument('archive', help="Path to a .scarc archive")
+    command.add_argument('--since', help="Local time to start from, e.g. '2024-05-26 19:00'")
+    command.add_argument('--until', help="Local time to stop at; a bare date includes the whole day")
+    command.add_argument('--events', action='store_true', help="Write the extracted events as JSON lines")
+    command.add_argument('--kinds', help="With --events, comma-separated event kinds")
+    command.add_argument('--output', '-o', help="Append to this file instead of writing to stdout")
+    command.set_defaults(lines=False)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        # tkinter is only imported for the GUI
+        from gui import Application
+        app = Application()
+        app.mainloop()
+        return 0
+
+    if args.command in ('scan', 'follow') and not os.path.isfile(args.log):
+        print(f"Log file not found: {args.log}", file=sys.stderr)
+        return 1
+    commands = {'scan': scan, 'follow': follow, 'archive': archive_logs, 'extract': extract}
+    try:
+        return commands[args.command](args)
+    except BrokenPipeError:
+        # Output closed early, e.g. piped into head
+        sys.stderr.close()
+        return 0
 
-        try:
-            with open(self.log_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                self.log_text.insert(tk.END, content)
-                self.log_text.see(tk.END)
-                
-                # Create monitor first so it's available for parsing kills
-                self.monitor = LogMonitor(self.log_text, self.kills_tree, self.log_path)
-                
-                # Process existing kills
-                for line in content.splitlines():
-                    if '<Actor Death>' in line:
-                        self.monitor.parse_kill(line)
-        except Exception as e:
-            self.log_text.insert(tk.END, f"Error reading log file: {str(e)}\n")
-            return
-
-        # Set up watchdog observer
-        try:
-            self.observer = Observer()
-            self.observer.schedule(self.monitor, os.path.dirname(self.log_path), recursive=False)
-            self.observer.start()
-            self.check_updates()
-        except Exception as e:
-            self.log_text.insert(tk.END, f"Error setting up file monitoring: {str(e)}\n")
-
-    def toggle_pause(self):
-        self.log_paused = not self.log_paused
-        if self.log_paused:
-            self.pause_button.configure(text="Resume Log")
-        else:
-            self.pause_button.configure(text="Pause Log")
-            # Ensure we're at the end of the log when resuming
-            self.log_text.see(tk.END)
-
-    def toggle_hud(self):
-        if self.hud_window and self.hud_window.winfo_exists():
-            self.hud_window.destroy()
-            self.hud_window = None
-            self.hud_button.configure(text="Pop HUD")
-        else:
-            self.create_hud_window()
-            self.hud_button.configure(text="Close HUD")
-
-    def create_hud_window(self):
-        # Create a new toplevel window
-        self.hud_window = tk.Toplevel(self)
-        self.hud_window.title("Kill Feed HUD")
-        
-        # Make it frameless
-        self.hud_window.overrideredirect(True)
-        
-        # Set window attributes
-        self.hud_window.attributes('-topmost', True)  # Always on top
-        self.hud_window.attributes('-alpha', 0.85)    # Slight transparency
-        
-        # Create main frame with dark theme
-        main_frame = tk.Frame(
-            self.hud_window,
-            bg='#1a1b1e',
-            highlightthickness=1,
-            highlightbackground='#663399'  # Purple border
-        )
-        main_frame.pack(fill='both', expand=True)
-        
-        # Add a title bar
-        title_frame = tk.Frame(main_frame, bg='#663399')
-        title_frame.pack(fill='x')
-        
-        # Add title label
-        title_label = tk.Label(
-            title_frame,
-            text="Star Citizen Kill Feed",
-            bg='#663399',
-            fg='white',
-            font=('Segoe UI', 10, 'bold')
-        )
-        title_label.pack(side='left', padx=5, pady=2)
-        
-        # Add close button
-        close_btn = tk.Label(
-            title_frame,
-            text="×",
-            bg='#663399',
-            fg='white',
-            font=('Segoe UI', 10, 'bold'),
-            cursor='hand2'
-        )
-        close_btn.pack(side='right', padx=5, pady=2)
-        close_btn.bind('<Button-1>', lambda e: self.toggle_hud())
-        
-        # Create a treeview for kills
-        self.hud_tree = ttk.Treeview(
-            main_frame,
-            columns=('Victim', 'Killer', 'Time'),
-            show='headings',
-            style='Treeview',
-            height=5
-        )
-        
-        # Configure columns
-        self.hud_tree.heading('Victim', text='Victim')
-        self.hud_tree.heading('Killer', text='Killed By')
-        self.hud_tree.heading('Time', text='Time')
-        
-        self.hud_tree.column('Victim', width=150)
-        self.hud_tree.column('Killer', width=150)
-        self.hud_tree.column('Time', width=100)
-        
-        # Style the treeview
-        style = ttk.Style()
-        style.configure(
-            'Treeview',
-            background='#1a1b1e',
-            foreground='white',
-            fieldbackground='#1a1b1e'
-        )
-        style.configure(
-            'Treeview.Heading',
-            background='#2a2b2e',
-            foreground='white'
-        )
-        
-        self.hud_tree.pack(fill='both', expand=True, padx=5, pady=5)
-        
-        # Make window draggable
-        title_frame.bind('<Button-1>', self.start_drag)
-        title_frame.bind('<B1-Motion>', self.do_drag)
-        
-        # Position the window in the top-right corner initially
-        screen_width = self.winfo_screenwidth()
-        self.hud_window.geometry(f"+{screen_width-420}+10")
-        
-        # Configure tags for special styling
-        self.hud_tree.tag_configure('skill_issue', foreground='#FF5555')
-        
-        # Sync current kills to HUD
-        self.sync_hud_kills()
-        
-    def start_drag(self, event):
-        self._drag_data = {'x': event.x, 'y': event.y}
-
-    def do_drag(self, event):
-        if self.hud_window:
-            x = self.hud_window.winfo_x() + (event.x - self._drag_data['x'])
-            y = self.hud_window.winfo_y() + (event.y - self._drag_data['y'])
-            self.hud_window.geometry(f"+{x}+{y}")
-
-    def sync_hud_kills(self):
-        if not self.hud_window or not self.hud_window.winfo_exists():
-            return
-            
-        # Clear current HUD entries
-        for item in self.hud_tree.get_children():
-            self.hud_tree.delete(item)
-            
-        # Get the last 5 kills from the main tree
-        main_items = self.kills_tree.get_children()[:5]
-        for item in reversed(main_items):
-            values = self.kills_tree.item(item)['values']
-            tags = self.kills_tree.item(item)['tags']
-            self.hud_tree.insert('', 'end', values=values[:3], tags=tags)
-
-    def check_updates(self):
-        if self.monitor and not self.log_paused:
-            self.monitor.check_file()
-        self.after(100, self.check_updates)  # Schedule next check in 100ms
 
 if __name__ == "__main__":
-    app = Application()
-    app.mainloop()
\ No newline at end of file
+    # The backup importer uses worker processes, which need this in a frozen build
+    multiprocessing.freeze_support()
+    sys.exit(main())
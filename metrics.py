@@ -0,0 +1,144 @@
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STAGES = ('read', 'decode', 'parse', 'store', 'render')
+# Latency bucket upper bounds in seconds, doubling from 1 us to about 8 s
+BUCKETS = tuple(1e-6 * 2 ** i for i in range(24))
+RATE_WINDOW = 5.0  # Seconds of samples behind the per-second rates
+
+
+class Histogram:
+    # Fixed log-scale buckets: constant memory and O(1) inserts, percentiles
+    # are accurate to within one bucket (a factor of two)
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean_ms': 1000 * self.total / self.count,
+            'p50_ms': 1000 * self.percentile(0.5),
+            'p90_ms': 1000 * self.percentile(0.9),
+            'p99_ms': 1000 * self.percentile(0.99),
+            'max_ms': 1000 * self.max,
+        }
+
+
+class Metrics:
+    # Pipeline instrumentation shared by the reader thread and the Tk thread:
+    # counters (bytes, lines, events...), gauges (queue depths) and one
+    # latency histogram per stage. Stages time whole chunks or batches, never
+    # single lines, so the overhead stays negligible. Rates are computed from
+    # the counter samples taken by sample() over the last few seconds.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.latency = {stage: Histogram() for stage in STAGES}
+        self.samples = deque()
+        self.started = time.time()
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.latency.get(stage)
+            if histogram is None:
+                histogram = self.latency[stage] = Histogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def uptime(self):
+        return time.time() - self.started
+
+    def sample(self):
+        # Records the counters now and returns the per-second rates over RATE_WINDOW
+        now = time.monotonic()
+        with self.lock:
+            counters = dict(self.counters)
+        self.samples.append((now, counters))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= RATE_WINDOW:
+            self.samples.popleft()
+        then, old = self.samples[0]
+        elapsed = now - then
+        if elapsed <= 0:
+            return {}
+        return {name: (value - old.get(name, 0)) / elapsed for name, value in counters.items()}
+
+    def snapshot(self):
+        rates = self.sample()
+        with self.lock:
+            return {
+                'time': time.time(),
+                'uptime': self.uptime(),
+                'counters': dict(self.counters),
+                'rates': rates,
+                'gauges': dict(self.gauges),
+                'latency': {stage: h.summary() for stage, h in self.latency.items()},
+            }
+
+    def dump(self, path, snapshot=None):
+        # Appends one JSON line
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot or self.snapshot()) + '\n')
+
+
+def format_snapshot(snapshot):
+    # Plain text for the stats panel
+    rates = snapshot['rates']
+    lines = ['Throughput (per second)']
+    for name in ('bytes', 'lines', 'events', 'kills'):
+        lines.append(f"  {name:<8} {rates.get(name, 0):>12,.0f}   total {snapshot['counters'].get(name, 0):,}")
+    lines.append('')
+    lines.append(f"{'Stage':<8} {'count':>9} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)")
+    for stage, summary in snapshot['latency'].items():
+        if not summary['count']:
+            lines.append(f"{stage:<8} {0:>9}")
+            continue
+        lines.append(f"{stage:<8} {summary['count']:>9} {summary['mean_ms']:>9.3f} {summary['p50_ms']:>9.3f} "
+                     f"{summary['p90_ms']:>9.3f} {summary['p99_ms']:>9.3f} {summary['max_ms']:>9.3f}")
+    if snapshot['gauges']:
+        lines.append('')
+        lines.append('Queues')
+        for name, value in sorted(snapshot['gauges'].items()):
+            lines.append(f"  {name:<20} {value}")
+    return '\n'.join(lines)
@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+
+from watchdog.events import FileSystemEventHandler
+
+from scheduler import TailScheduler
+from tailer import LogTailer
+
+MAX_QUEUED_BATCHES = 64
+MAX_EVENTS_PER_TICK = 20000
+
+
+class LogMonitor(FileSystemEventHandler):
+    # Producer side of the pipeline. Watchdog callbacks only signal; the
+    # scheduler's reader thread does all the file I/O and parsing and puts
+    # batches of events on a bounded queue. The Tk thread drains that queue
+    # and is the only one touching widgets. When the consumer falls behind,
+    # the reader blocks and the unread data simply waits in the file.
+    #
+    # Monitors of several logs can share one scheduler (and one watchdog
+    # observer); each keeps its own tailer, position and queue, so the
+    # consumer always knows which source a batch came from.
+
+    def __init__(self, log_path, max_queued=MAX_QUEUED_BATCHES, metrics=None, source=None, scheduler=None):
+        self.log_path = log_path
+        self.source = source
+        self.tailer = LogTailer(log_path, metrics=metrics)
+        self.events = queue.Queue(maxsize=max_queued)
+        self.position = 0  # Offset up to which events were handed to the consumer
+        self.max_read_bytes = 1024 * 1024  # Keep each batch short during log spam
+        self.lock = threading.Lock()
+        self.shared = scheduler is not None  # Started and stopped by its owner
+        self.scheduler = scheduler or TailScheduler(self.read_available)
+        self.stopped = threading.Event()
+
+    def read_events(self, max_bytes=None):
+        with self.lock:
+            if self.stopped.is_set():
+                return [], self.tailer.position  # The tailer may already be closed
+            events = list(self.tailer.events(max_bytes))
+            return events, self.tailer.position
+
+    def start(self):
+        if self.shared:
+            self.scheduler.add(self.read_available)
+        else:
+            self.scheduler.start()
+
+    def read_available(self):
+        # Runs on the scheduler thread; returns True if anything was read
+        stopping = self.scheduler.stopping
+        busy = False
+        while not (stopping.is_set() or self.stopped.is_set()):
+            events, end = self.read_events(self.max_read_bytes)
+            if not events:
+                break
+            busy = True
+            while not (stopping.is_set() or self.stopped.is_set()):
+                try:
+                    self.events.put((events, end), timeout=0.5)
+                    break
+                except queue.Full:
+                    continue  # Backpressure: wait for the consumer
+        return busy
+
+    def drain(self, max_events=MAX_EVENTS_PER_TICK):
+        # Called on the consumer thread; returns everything queued, batched
+        events = []
+        while len(events) < max_events:
+            try:
+                batch, end = self.events.get_nowait()
+            except queue.Empty:
+                break
+            events.extend(batch)
+            self.position = end
+        return events
+
+    def stop(self):
+        self.stopped.set()
+        if self.shared:
+            self.scheduler.remove(self.read_available)
+        else:
+            self.scheduler.stop()
+        with self.lock:
+            self.tailer.close()
+
+    def on_any_event(self, event):
+        # Modified, but also created or moved when the game starts a new log
+        target = os.path.normcase(os.path.abspath(self.log_path))
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path and os.path.normcase(os.path.abspath(path)) == target:
+                self.scheduler.notify()
+                return
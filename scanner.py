@@ -0,0 +1,73 @@
+import mmap
+import os
+
+from log_parser import EVENT_TAGS, parse_line
+
+WINDOW_SIZE = 16 * 1024 * 1024  # Bytes mapped at a time
+
+
+def scan_windows(path, start=0, end=None, tags=EVENT_TAGS, window_size=WINDOW_SIZE, encoding='utf-8'):
+    # Finds the events between byte offsets start and end (start must be the
+    # start of a line) without reading the log line by line. The file is
+    # mapped one window at a time and searched for the event tags as bytes;
+    # only the lines holding a tag are decoded and parsed. Memory use depends
+    # on the window size, not on the size of the log.
+    #
+    # Yields (events, position) per window, position being the offset up to
+    # which the log has been scanned.
+    needles = [tag.encode('ascii') for tag in tags]
+    granularity = mmap.ALLOCATIONGRANULARITY
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        pos = start
+        while pos < end:
+            base = pos - pos % granularity
+            length = min(end, base + window_size) - base
+            with mmap.mmap(f.fileno(), length, offset=base, access=mmap.ACCESS_READ) as data:
+                events, scanned = _scan_window(data, pos - base, length, base + length == end,
+                                               needles, base, encoding)
+            if scanned == pos - base:
+                # A single line longer than the window: map more at once
+                window_size *= 2
+                continue
+            pos = base + scanned
+            yield events, pos
+
+
+def _scan_window(data, begin, length, at_end, needles, base, encoding):
+    # Returns (events, scanned): the events of the complete lines in
+    # data[begin:length] and the window offset where scanning stopped
+    hits = []
+    for needle in needles:
+        hit = data.find(needle, begin)
+        while hit >= 0:
+            hits.append(hit)
+            hit = data.find(needle, hit + len(needle))
+    hits.sort()
+
+    events = []
+    line_end = begin
+    for hit in hits:
+        if hit < line_end:
+            continue  # A second tag in a line that was already parsed
+        line_start = data.rfind(b'\n', begin, hit) + 1 or begin
+        line_end = data.find(b'\n', hit)
+        if line_end < 0:
+            if not at_end:
+                # The line continues in the next window
+                return events, line_start
+            line_end = length
+        text = data[line_start:line_end].decode(encoding, errors='replace').rstrip('\r')
+        event = parse_line(text, base + line_start)
+        if event is not None:
+            events.append(event)
+    if at_end:
+        return events, length
+    # Stop after the last complete line so the next window starts on a line
+    return events, data.rfind(b'\n', begin, length) + 1 or begin
+
+
+def scan_events(path, start=0, end=None, tags=EVENT_TAGS):
+    for events, _ in scan_windows(path, start, end, tags):
+        yield from events
@@ -0,0 +1,92 @@
+import sys
+import threading
+
+
+class Backoff:
+    # Interval that drops to the minimum while there is work and doubles up
+    # to the maximum while idle
+
+    def __init__(self, minimum, maximum, factor=2.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.current = minimum
+
+    def update(self, busy):
+        if busy:
+            self.current = self.minimum
+        else:
+            self.current = min(self.maximum, self.current * self.factor)
+        return self.current
+
+
+class TailScheduler:
+    # Runs the work functions on a background thread whenever there may be
+    # something new to read. Several monitors can share one scheduler, each
+    # adding its own work. A filesystem notification wakes it immediately; without
+    # notifications it polls with exponential backoff, tightening to the
+    # minimum interval during bursts. Once notifications have been seen,
+    # polling only acts as a slow safety net. While paused the thread blocks
+    # instead of polling.
+
+    def __init__(self, work=None, min_interval=0.01, max_interval=0.5, safety_interval=1.0):
+        self.works = [work] if work else []  # Each returns True when it found something to do
+        self.backoff = Backoff(min_interval, max_interval)
+        self.safety_interval = safety_interval
+        self.notified = False
+        self.wakeup = threading.Event()
+        self.running = threading.Event()
+        self.running.set()
+        self.stopping = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        self.running.set()
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def add(self, work):
+        self.works = self.works + [work]  # Replaced, never mutated, while the thread iterates
+        self.wakeup.set()
+
+    def remove(self, work):
+        self.works = [w for w in self.works if w != work]
+
+    def notify(self):
+        # Called from the watchdog thread
+        self.notified = True
+        self.wakeup.set()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+        self.wakeup.set()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.running.wait()
+            if self.stopping.is_set():
+                break
+
+            busy = False
+            for work in self.works:
+                try:
+                    busy = work() or busy
+                except Exception as e:
+                    # stdout may be the event stream of the headless mode
+                    print(f"Error reading log: {str(e)}", file=sys.stderr)
+
+            interval = self.backoff.update(busy)
+            if self.notified and not busy:
+                interval = self.safety_interval
+            self.wakeup.wait(interval)
+            self.wakeup.clear()
@@ -0,0 +1,40 @@
+import os
+
+from kill_stats import KillStats
+
+# Game environments installed side by side under StarCitizen/, each with its own Game.log
+ENVIRONMENTS = ('LIVE', 'PTU', 'EPTU', 'TECH-PREVIEW')
+
+
+def find_sources(log_path):
+    # The selected log plus the Game.log of every other environment installed
+    # next to it, as {name: path} with the selected one first. A log outside
+    # the usual layout is monitored on its own.
+    log_path = os.path.abspath(log_path)
+    folder = os.path.dirname(log_path)
+    selected = os.path.basename(folder).upper()
+    if selected not in ENVIRONMENTS:
+        return {os.path.basename(folder) or 'LOG': log_path}
+
+    sources = {selected: log_path}
+    root = os.path.dirname(folder)
+    for name in ENVIRONMENTS:
+        path = os.path.join(root, name, os.path.basename(log_path))
+        if name not in sources and os.path.exists(path):
+            sources[name] = path
+    return sources
+
+
+class LogSource:
+    # Pipeline state of one monitored log: its monitor, the key of the
+    # session it is on, its own history backfill, search index and
+    # statistics. Offsets and caches are never shared between sources.
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.monitor = None
+        self.log_key = None
+        self.history_loader = None
+        self.log_index = None
+        self.kill_stats = KillStats()
@@ -0,0 +1,298 @@
+import os
+import sys
+import time
+
+from events import LogLine, SessionBoundaryEvent
+from log_parser import parse_line
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_LINES = 5000  # Lines of a log shown at startup (log_view_lines in the config)
+HEADER_SIZE = 256  # Leading bytes compared to notice a rewritten log
+
+
+def open_shared(path):
+    # On Windows a plain open() keeps the game from renaming Game.log into
+    # logbackups when it starts a new session. Opening with FILE_SHARE_DELETE
+    # lets the rename go ahead while we finish reading the old file.
+    if sys.platform != 'win32':
+        return open(path, 'rb')
+
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    GENERIC_READ = 0x80000000
+    FILE_SHARE_ALL = 0x1 | 0x2 | 0x4  # Read, write and delete
+    OPEN_EXISTING = 3
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    create_file = ctypes.windll.kernel32.CreateFileW
+    create_file.restype = wintypes.HANDLE
+    handle = create_file(path, GENERIC_READ, FILE_SHARE_ALL, None, OPEN_EXISTING, 0, None)
+    if handle == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError()
+    fd = msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY)
+    return os.fdopen(fd, 'rb')
+
+
+def read_lines_before(path, end, count, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    # Reads backwards from byte offset end and returns (lines, stop): up to
+    # count complete lines as (offset, text) in file order, and the offset just
+    # past the last of them. Only the blocks holding those lines are read.
+    with open(path, 'rb') as file:
+        pos = end
+        blocks = []
+        newlines = 0
+        while pos > 0 and newlines <= count:
+            step = min(chunk_size, pos)
+            pos -= step
+            file.seek(pos)
+            block = file.read(step)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+
+    data = b''.join(reversed(blocks))
+    last = data.rfind(b'\n')
+    if last < 0:
+        return [], pos
+    stop = pos + last + 1
+
+    raw_lines = data[:last].split(b'\n')
+    offset = pos
+    if pos > 0:
+        # The first piece is the tail of a line that starts further back
+        offset += len(raw_lines[0]) + 1
+        raw_lines = raw_lines[1:]
+    if len(raw_lines) > count:
+        for raw in raw_lines[:len(raw_lines) - count]:
+            offset += len(raw) + 1
+        raw_lines = raw_lines[len(raw_lines) - count:]
+
+    lines = []
+    for raw in raw_lines:
+        lines.append((offset, raw.decode(encoding, errors='replace').rstrip('\r')))
+        offset += len(raw) + 1
+    return lines, stop
+
+
+def read_lines_from(path, start, count, encoding='utf-8'):
+    # The count complete lines starting at byte offset start, as (offset, text)
+    tailer = LogTailer(path, encoding=encoding)
+    tailer.seek(start)
+    lines = []
+    try:
+        for line in tailer.read_lines():
+            lines.append(line)
+            if len(lines) >= count:
+                break
+    finally:
+        tailer.close()
+    return lines
+
+
+def read_lines_at(path, offsets, encoding='utf-8'):
+    # The lines starting at each of the given byte offsets, as (offset, text)
+    lines = []
+    with open(path, 'rb') as file:
+        for offset in offsets:
+            file.seek(offset)
+            raw = file.readline().rstrip(b'\n')
+            lines.append((offset, raw.decode(encoding, errors='replace').rstrip('\r')))
+    return lines
+
+
+class LogTailer:
+    # Follows a growing log file without any GUI dependency. The file stays
+    # open between reads, data is read as bytes in bounded chunks and only
+    # complete lines are decoded and handed out; a trailing partial line is
+    # kept until the game finishes writing it.
+    #
+    # The tailer also notices when the game starts a new log: the path
+    # pointing at a different file (replaced or rotated into logbackups), the
+    # file getting shorter than what was already read (truncated), or its
+    # first bytes changing (truncated and rewritten between two reads). It
+    # then continues from the start of the new log and emits a
+    # SessionBoundaryEvent so consumers can react.
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8', metrics=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.metrics = metrics  # Optional Metrics, timed per chunk
+        self.position = 0  # Byte offset just past the last complete line
+        self._file = None
+        self._pending = b''
+        self._identity = None  # (st_dev, st_ino) of the open file
+        self._last_stat = None
+        self._header = b''
+
+    def open(self):
+        if self._file is None:
+            self._file = open_shared(self.path)
+            stat = os.fstat(self._file.fileno())
+            self._identity = (stat.st_dev, stat.st_ino)
+            self._remember_start()
+        return self._file
+
+    def _remember_start(self):
+        # Size, mtime and first bytes of the open file as it is now, to
+        # compare against on the next read
+        stat = os.fstat(self._file.fileno())
+        self._last_stat = (stat.st_size, stat.st_mtime_ns)
+        self._file.seek(0)
+        self._header = self._file.read(HEADER_SIZE)
+        self._file.seek(self.position)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._pending = b''
+
+    @property
+    def read_offset(self):
+        # Bytes taken from the file so far, including a partial last line
+        return self.position + len(self._pending)
+
+    def seek(self, position):
+        self.position = position
+        self._pending = b''
+        if self._file is not None:
+            self._file.seek(position)
+
+    def read_lines(self, max_bytes=None):
+        # Yields (offset, text) for every complete line available, reading at
+        # most max_bytes from disk (or until EOF when max_bytes is None)
+        for lines in self._read_chunks(max_bytes):
+            for offset, end, text in lines:
+                self.position = end
+                yield offset, text
+
+    def _read_chunks(self, max_bytes):
+        # Yields the complete lines of each chunk read as a list of
+        # (offset, end, text). The consumer advances self.position.
+        if self._file is None:
+            if not os.path.exists(self.path):
+                return
+            self.open()
+
+        metrics = self.metrics
+        budget = max_bytes
+        finished = False
+        try:
+            while budget is None or budget > 0:
+                size = self.chunk_size if budget is None else min(self.chunk_size, budget)
+                started = time.perf_counter()
+                chunk = self._file.read(size)
+                if not chunk:
+                    break
+                if budget is not None:
+                    budget -= len(chunk)
+                if metrics is not None:
+                    metrics.count('bytes', len(chunk))
+
+                data = self._pending + chunk
+                end = data.rfind(b'\n')
+                if end < 0:
+                    self._pending = data
+                    continue
+                self._pending = data[end + 1:]
+                decoding = time.perf_counter()
+
+                lines = []
+                offset = self.position
+                for raw in data[:end].split(b'\n'):
+                    # A bad byte only affects the line it is in
+                    text = raw.decode(self.encoding, errors='replace')
+                    lines.append((offset, offset + len(raw) + 1, text.rstrip('\r')))
+                    offset += len(raw) + 1
+                if metrics is not None:
+                    decoded = time.perf_counter()
+                    metrics.observe('read', decoding - started)
+                    metrics.observe('decode', decoded - decoding)
+                    metrics.count('lines', len(lines))
+                yield lines
+            finished = True
+        finally:
+            if not finished and self._file is not None:
+                # Consumer stopped early: rewind so unconsumed lines are read again
+                self.seek(self.position)
+
+    def _header_matches(self):
+        pos = self._file.tell()
+        self._file.seek(0)
+        head = self._file.read(HEADER_SIZE)
+        self._file.seek(pos)
+        if head[:len(self._header)] != self._header:
+            return False
+        self._header = head  # The header may have been shorter than HEADER_SIZE
+        return True
+
+    def check_rotation(self):
+        # Returns None, 'replaced' or 'truncated'
+        if self._file is None:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None  # Mid-rotation, keep reading the old file for now
+        if self._identity[1] and (stat.st_dev, stat.st_ino) != self._identity:
+            return 'replaced'
+        if stat.st_size < self.position + len(self._pending):
+            return 'truncated'
+        if (stat.st_size, stat.st_mtime_ns) != self._last_stat:
+            self._last_stat = (stat.st_size, stat.st_mtime_ns)
+            if not self._header_matches():
+                return 'truncated'
+        return None
+
+    def _parse(self, lines):
+        for offset, text in lines:
+            yield LogLine(offset, text)
+            event = parse_line(text, offset)
+            if event is not None:
+                yield event
+
+    def finish(self):
+        # Events of a last line that will never get a newline now, for a log
+        # that was replaced or is read as a whole
+        if self._pending:
+            text = self._pending.decode(self.encoding, errors='replace').rstrip('\r')
+            yield from self._parse([(self.position, text)])
+            self.position += len(self._pending)
+            self._pending = b''
+
+    def events(self, max_bytes=None):
+        # Typed events in file order: every line, followed by whatever the
+        # parser recognized in it
+        reason = self.check_rotation()
+        if reason == 'replaced':
+            # The old file may still hold lines that were not read yet
+            yield from self._parse(self.read_lines())
+            yield from self.finish()
+            self.close()
+            self.position = 0
+            yield SessionBoundaryEvent(0, reason)
+        elif reason == 'truncated':
+            # Nothing after the start of the file is known any more; its new
+            # start is what a later rewrite gets compared against
+            self.seek(0)
+            self._remember_start()
+            yield SessionBoundaryEvent(0, reason)
+
+        metrics = self.metrics
+        for lines in self._read_chunks(max_bytes):
+            # Parse the whole chunk first so it can be timed as one stage
+            started = time.perf_counter()
+            parsed = []
+            for offset, end, text in lines:
+                parsed.append((end, LogLine(offset, text)))
+                event = parse_line(text, offset)
+                if event is not None:
+                    parsed.append((end, event))
+            if metrics is not None:
+                metrics.observe('parse', time.perf_counter() - started)
+                metrics.count('events', len(parsed) - len(lines))
+            for end, event in parsed:
+                self.position = end
+                yield event